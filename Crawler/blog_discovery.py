@@ -1,22 +1,46 @@
 import requests
-from googleapiclient.discovery import build
 import time
 import random
+import re
 from urllib.parse import urlparse
 from .config import GOOGLE_API_KEY, GOOGLE_CSE_ID, USER_AGENTS, FOUNDER_KEYWORDS, GEMINI_API_KEY, GEMINI_MODEL, SKIP_URL_WORDS
+from .google_search import google_search_many, google_search_pages
 import google.generativeai as genai
 import json
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
+# Indicator keywords compiled into single alternations so each text is scanned once
+# Blog and personal/author indicators share one pattern since either one qualifies
+_FOUNDER_BLOG_INDICATOR_RE = re.compile('|'.join(map(re.escape, [
+    'blog', 'post', 'article', 'thoughts', 'insights', 'medium', 'substack', 'author', 'written by'
+])))
+_NEWS_INDICATOR_RE = re.compile('|'.join(map(re.escape, ['news', 'article', 'press', 'interview', 'review', 'analysis'])))
+
 class BlogDiscovery:
+    # Search query templates; {f} is the founder name and {c} the company name
+    FOUNDER_QUERY_TEMPLATES = (
+        '"{f}" blog',
+        '"{f}" "{c}" blog',
+        '"{f}" author blog',
+        '"{f}" medium.com',
+        '"{f}" substack.com',
+        '"{f}" linkedin.com posts',
+        '"{f}" twitter.com blog',
+        '"{f}" personal blog'
+    )
+    COMPANY_MENTION_QUERY_TEMPLATES = (
+        '"{c}" news',
+        '"{c}" article',
+        '"{c}" press release',
+        '"{c}" interview',
+        '"{c}" review',
+        '"{c}" analysis'
+    )
+    
     def __init__(self, custom_skip_words=None):
-        self.google_service = None
-        if GOOGLE_API_KEY and GOOGLE_CSE_ID:
-            try:
-                self.google_service = build("customsearch", "v1", developerKey=GOOGLE_API_KEY)
-            except Exception as e:
-                print(f"Error initializing Google Search API: {str(e)}")
+        # Searches go through the shared REST client in google_search; only its credentials are needed
+        self.search_available = bool(GOOGLE_API_KEY and GOOGLE_CSE_ID)
         
         # Initialize LLM for URL validation
         self.llm = None
@@ -35,7 +59,7 @@ class BlogDiscovery:
         # Company info for URL filtering
         self.company_name = None
         self.company_url = None
-        self.skip_words = SKIP_URL_WORDS + (custom_skip_words or [])
+        self.skip_words = tuple(dict.fromkeys(word.lower() for word in SKIP_URL_WORDS + (custom_skip_words or [])))
     
     def set_company_info(self, company_name, company_url):
         """Set company information for URL filtering"""
@@ -51,9 +75,7 @@ class BlogDiscovery:
         company_name_lower = self.company_name.lower()
         company_url_lower = self.company_url.lower()
         
-        for skip_word in self.skip_words:
-            skip_word_lower = skip_word.lower()
-            
+        for skip_word_lower in self.skip_words:
             # Check if skip word is in the URL
             if skip_word_lower in url_lower:
                 # But don't skip if the word is part of the company name
@@ -75,10 +97,12 @@ class BlogDiscovery:
         
         founder_blogs = []
         
-        if not self.google_service:
+        if not self.search_available:
             print("Google Search API not available. Skipping founder blog search.")
             return founder_blogs
         
+        # Collect the queries for every founder, then run them concurrently
+        founder_queries = []
         for founder in founders:
             if not founder or founder.lower() in ['unknown', 'n/a', '']:
                 continue
@@ -86,47 +110,37 @@ class BlogDiscovery:
             print(f"Searching for blogs by: {founder}")
             
             # Search queries for founder blogs
-            search_queries = [
-                f'"{founder}" blog',
-                f'"{founder}" "{company_name}" blog',
-                f'"{founder}" author blog',
-                f'"{founder}" medium.com',
-                f'"{founder}" substack.com',
-                f'"{founder}" linkedin.com posts',
-                f'"{founder}" twitter.com blog',
-                f'"{founder}" personal blog'
-            ]
-            
-            for query in search_queries:
-                try:
-                    results = self._google_search(query, max_results=5)
-                    
-                    for result in results:
-                        url = result.get('link', '')
-                        title = result.get('title', '')
-                        snippet = result.get('snippet', '')
-                        
-                        # Apply URL filtering
-                        if self.should_skip_url(url):
-                            print(f"Skipping founder blog URL due to filter: {url}")
-                            continue
-                        
-                        # Validate if this is likely a blog by the founder
-                        if self._validate_founder_blog(url, title, snippet, founder, company_name):
-                            founder_blogs.append({
-                                'url': url,
-                                'title': title,
-                                'founder': founder,
-                                'source': 'google_search',
-                                'type': 'founder_blog'
-                            })
-                    
-                    # Rate limiting
-                    time.sleep(2)
-                    
-                except Exception as e:
-                    print(f"Error searching for {founder}: {str(e)}")
+            founder_queries.extend((founder, template.format(f=founder, c=company_name))
+                                   for template in self.FOUNDER_QUERY_TEMPLATES)
+        
+        all_results = google_search_many((query for _, query in founder_queries), max_results=5)
+        
+        # Overlapping queries return the same URLs; once a URL is accepted it isn't checked again.
+        # Rejected URLs are not recorded, since a result that fails for one founder may match another
+        seen_urls = set()
+        for (founder, query), results in zip(founder_queries, all_results):
+            for result in results:
+                url = result.get('link', '')
+                if url in seen_urls:
+                    continue
+                title = result.get('title', '')
+                snippet = result.get('snippet', '')
+                
+                # Apply URL filtering
+                if self.should_skip_url(url):
+                    print(f"Skipping founder blog URL due to filter: {url}")
                     continue
+                
+                # Validate if this is likely a blog by the founder
+                if self._validate_founder_blog(url, title, snippet, founder, company_name):
+                    seen_urls.add(url)
+                    founder_blogs.append({
+                        'url': url,
+                        'title': title,
+                        'founder': founder,
+                        'source': 'google_search',
+                        'type': 'founder_blog'
+                    })
         
         print(f"Found {len(founder_blogs)} potential founder blogs")
         return founder_blogs
@@ -138,54 +152,46 @@ class BlogDiscovery:
         # Step 1: Collect all potential external URLs
         potential_urls = []
         
-        if not self.google_service:
+        if not self.search_available:
             print("Google Search API not available. Skipping external mentions search.")
             return [], []
         
         # Search queries for company mentions
-        search_queries = [
-            f'"{company_name}" news',
-            f'"{company_name}" article',
-            f'"{company_name}" press release',
-            f'"{company_name}" interview',
-            f'"{company_name}" review',
-            f'"{company_name}" analysis'
-        ]
+        search_queries = [template.format(c=company_name) for template in self.COMPANY_MENTION_QUERY_TEMPLATES]
         
-        for query in search_queries:
-            try:
-                results = self._google_search(query, max_results=10)
+        company_tokens = self._company_domain_tokens(company_name)
+        
+        # Overlapping queries return the same URLs; once a URL is accepted it isn't checked or
+        # LLM-validated again. Rejected URLs are not recorded, since another query's title and
+        # snippet for the same URL may still pass
+        seen_urls = set()
+        for results in google_search_many(search_queries, max_results=10):
+            for result in results:
+                url = result.get('link', '')
+                if url in seen_urls:
+                    continue
+                title = result.get('title', '')
+                snippet = result.get('snippet', '')
                 
-                for result in results:
-                    url = result.get('link', '')
-                    title = result.get('title', '')
-                    snippet = result.get('snippet', '')
-                    
-                    # Skip if it's from the company's own domain
-                    if self._is_company_domain(url, company_name):
-                        continue
-                    
-                    # Apply URL filtering
-                    if self.should_skip_url(url):
-                        print(f"Skipping external mention URL due to filter: {url}")
-                        continue
-                    
-                    # Basic validation - if it passes, add to potential URLs
-                    if self._validate_company_mention(url, title, snippet, company_name):
-                        potential_urls.append({
-                            'url': url,
-                            'title': title,
-                            'snippet': snippet,
-                            'source': 'google_search',
-                            'type': 'external_mention'
-                        })
+                # Skip if it's from the company's own domain
+                if self._is_company_domain(url, company_tokens):
+                    continue
                 
-                # Rate limiting
-                time.sleep(2)
+                # Apply URL filtering
+                if self.should_skip_url(url):
+                    print(f"Skipping external mention URL due to filter: {url}")
+                    continue
                 
-            except Exception as e:
-                print(f"Error searching for company mentions: {str(e)}")
-                continue
+                # Basic validation - if it passes, add to potential URLs
+                if self._validate_company_mention(url, title, snippet, company_name):
+                    seen_urls.add(url)
+                    potential_urls.append({
+                        'url': url,
+                        'title': title,
+                        'snippet': snippet,
+                        'source': 'google_search',
+                        'type': 'external_mention'
+                    })
         
         print(f"Found {len(potential_urls)} potential external mentions")
         
@@ -201,111 +207,43 @@ class BlogDiscovery:
         print(f"LLM validation results: {len(validated_urls)} validated, {len(rejected_urls)} potential")
         return validated_urls, rejected_urls
     
-    def _google_search(self, query, max_results=10):
-        """Perform Google Custom Search"""
-        try:
-            if not self.google_service:
-                return []
-                
-            results = []
-            for i in range(0, min(max_results, 10), 10):
-                search_results = self.google_service.cse().list(
-                    q=query,
-                    cx=GOOGLE_CSE_ID,
-                    start=i + 1
-                ).execute()
-                
-                if 'items' in search_results:
-                    results.extend(search_results['items'])
-                
-                if len(results) >= max_results:
-                    break
-            
-            return results[:max_results]
-            
-        except Exception as e:
-            print(f"Google search error: {str(e)}")
-            return []
-
-    def _google_search2(self, query, max_results=50):
-        """Perform Google Custom Search"""
-        try:
-            if not self.google_service:
-                return []
-                
-            results = []
-            for i in range(0, max_results, 10):
-                search_results = self.google_service.cse().list(
-                    q=query,
-                    cx=GOOGLE_CSE_ID,
-                    start=i + 1
-                ).execute()
-                
-                if 'items' in search_results:
-                    results.extend(search_results['items'])
-                
-                if len(results) >= max_results:
-                    break
-            
-            return results
-            
-        except Exception as e:
-            print(f"Google search error: {str(e)}")
-            return []
-
     def _validate_founder_blog(self, url, title, snippet, founder, company_name):
         """Validate if a URL is likely a blog by the founder"""
         # Check if founder name appears in title or snippet
         founder_lower = founder.lower()
-        title_lower = title.lower()
-        snippet_lower = snippet.lower()
+        # Newline-joined so no keyword can match across the title/snippet boundary
+        text = f"{title}\n{snippet}".lower()
         
-        if founder_lower not in title_lower and founder_lower not in snippet_lower:
+        if founder_lower not in text:
             return False
         
-        # Check for blog indicators
-        blog_indicators = ['blog', 'post', 'article', 'thoughts', 'insights', 'medium', 'substack']
-        has_blog_indicator = any(indicator in title_lower or indicator in snippet_lower 
-                               for indicator in blog_indicators)
-        
-        # Check for personal/author indicators
-        author_indicators = ['author', 'written by', 'by ' + founder_lower]
-        has_author_indicator = any(indicator in title_lower or indicator in snippet_lower 
-                                 for indicator in author_indicators)
-        
-        return has_blog_indicator or has_author_indicator
+        # Check for blog or personal/author indicators
+        return _FOUNDER_BLOG_INDICATOR_RE.search(text) is not None or f"by {founder_lower}" in text
     
     def _validate_company_mention(self, url, title, snippet, company_name):
         """Validate if a URL is a relevant mention of the company"""
-        company_lower = company_name.lower()
-        title_lower = title.lower()
-        snippet_lower = snippet.lower()
+        text = f"{title}\n{snippet}".lower()
         
         # Company name should appear in title or snippet
-        if company_lower not in title_lower and company_lower not in snippet_lower:
+        if company_name.lower() not in text:
             return False
         
         # Check for news/article indicators
-        news_indicators = ['news', 'article', 'press', 'interview', 'review', 'analysis']
-        has_news_indicator = any(indicator in title_lower or indicator in snippet_lower 
-                               for indicator in news_indicators)
-        
-        return has_news_indicator
+        return _NEWS_INDICATOR_RE.search(text) is not None
     
-    def _is_company_domain(self, url, company_name):
+    def _company_domain_tokens(self, company_name):
+        """Company name words long enough to identify its own domain"""
+        return tuple(dict.fromkeys(word for word in company_name.lower().split() if len(word) > 2))
+    
+    def _is_company_domain(self, url, company_tokens):
         """Check if URL is from the company's own domain"""
         try:
             domain = urlparse(url).netloc.lower()
-            company_words = company_name.lower().split()
-            
-            # Check if any company word appears in domain
-            for word in company_words:
-                if len(word) > 2 and word in domain:
-                    return True
-            
-            return False
-        except:
+        except ValueError:
             return False
+        
+        # Check if any company word appears in domain
+        return any(token in domain for token in company_tokens)
     
     def _validate_urls_with_llm(self, potential_urls, company_name, company_info):
         """Validate URLs using LLM in parallel"""
@@ -397,7 +335,7 @@ class BlogDiscovery:
     
     def search_blog_subpages(self, base_blog_url, max_results=50):
         """Use Google Custom Search to find all URLs from the same domain as base_blog_url"""
-        if not self.google_service:
+        if not self.search_available:
             print("Google Search API not available. Skipping blog subpage search.")
             return []
         # Extract domain for site: operator
@@ -408,7 +346,7 @@ class BlogDiscovery:
         # Build query: site:domain
         query = f'site:{domain} "blog"'
         print(f"Google searching for blog subpages with query: {query}")
-        results = self._google_search2(query, max_results=max_results)
+        results = google_search_pages(query, max_results=max_results)
         # Filter URLs to only those that start with the base_blog_url
         matching_urls = []
         # print(f"Results: {results}")
@@ -1,11 +1,36 @@
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import google.generativeai as genai
 from urllib.parse import urljoin, urlparse
+import html
+import itertools
 import json
 from .config import GEMINI_API_KEY, USER_AGENTS, GEMINI_MODEL
+import os
 import random
+import re
 import time
+from .disk_cache import JsonDiskCache, make_cache_key
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# LLM extractions are cached by page content so re-running a site skips the Gemini call
+LLM_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'llm_cache')
+LLM_CACHE_TTL = 30 * 24 * 3600
+# Pages with less text than this go straight to basic extraction
+MIN_LLM_TEXT_LENGTH = 300
+# Only this much of a page body is downloaded and parsed
+MAX_PAGE_BYTES = 512 * 1024
+_WHITESPACE_RE = re.compile(r'\s+')
+# Anchor hrefs pointing at a social network, matched straight off the raw markup
+_SOCIAL_HREF_RE = re.compile(
+    r'<a\b[^>]*?\bhref\s*=\s*["\']?([^"\'\s>]*(?:linkedin\.com|twitter\.com|x\.com|facebook\.com)[^"\'\s>]*)',
+    re.IGNORECASE
+)
 
 class CompanyExtractor:
     def __init__(self):
@@ -14,37 +39,63 @@ class CompanyExtractor:
             self.model = genai.GenerativeModel(GEMINI_MODEL)  # type: ignore
         else:
             self.model = None
+        self.llm_cache = JsonDiskCache(LLM_CACHE_DIR, LLM_CACHE_TTL)
+        # Rotate user agents round-robin from a random starting order
+        self._user_agents = itertools.cycle(random.sample(USER_AGENTS, len(USER_AGENTS)))
+        
+        # One pooled session so repeat fetches reuse keep-alive connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+    
+    def close(self):
+        """Close the pooled HTTP session"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def get_page_content(self, url):
         """Fetch and parse webpage content"""
         try:
-            headers = {
-                'User-Agent': random.choice(USER_AGENTS),
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
+            headers = {'User-Agent': next(self._user_agents)}
             
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
+            with self.session.get(url, headers=headers, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                
+                # Stream the body and stop at the cap; the LLM only ever sees the first 5000 characters
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=16384):
+                    body.extend(chunk)
+                    if len(body) >= MAX_PAGE_BYTES:
+                        print(f"Truncated {url} at {MAX_PAGE_BYTES} bytes")
+                        break
+                body = bytes(body[:MAX_PAGE_BYTES])
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # lxml's C parser is much faster than the pure-Python html.parser
+            soup = BeautifulSoup(body, 'lxml')
             
             # Remove script and style elements
             for script in soup(["script", "style"]):
                 script.decompose()
             
-            # Extract text content
-            text = soup.get_text()
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
+            # Extract text content with whitespace runs collapsed to single spaces
+            text = _WHITESPACE_RE.sub(' ', soup.get_text()).strip()
             
             return {
                 'title': soup.title.string if soup.title else '',
                 'text': text[:5000],  # Limit text for LLM processing
-                'html': str(soup),
+                'html': body.decode(soup.original_encoding or 'utf-8', errors='replace'),
                 'url': url
             }
         except Exception as e:
@@ -59,10 +110,20 @@ class CompanyExtractor:
         if not page_data:
             return None
         
-        if not self.model:
+        return self._extract_from_page(url, page_data)
+    
+    def _extract_from_page(self, url, page_data):
+        """Extract company information from already fetched page data"""
+        if not self.model or len(page_data['text']) < MIN_LLM_TEXT_LENGTH:
             # Fallback to basic extraction without LLM
             return self._basic_extraction(page_data)
         
+        cache_key = make_cache_key(GEMINI_MODEL, page_data['title'], page_data['text'][:3000])
+        cached_info = self.llm_cache.get(cache_key)
+        if cached_info is not None:
+            print("Using cached LLM extraction")
+            return {**cached_info, 'source_url': url}
+        
         try:
             prompt = f"""
             Extract company information from this webpage. Return a JSON object with the following structure:
@@ -103,8 +164,10 @@ class CompanyExtractor:
             elif response_text.startswith("```"):
                 response_text = response_text.replace("```", "").strip()
             
-            company_info = json.loads(response_text)
+            # orjson.JSONDecodeError subclasses ValueError, so the handler below covers both parsers
+            company_info = orjson.loads(response_text) if orjson is not None else json.loads(response_text)
             company_info['source_url'] = url
+            self.llm_cache.set(cache_key, company_info)
             
             return company_info
             
@@ -117,7 +180,7 @@ class CompanyExtractor:
     
     def _basic_extraction(self, page_data):
         """Basic extraction without LLM"""
-        soup = BeautifulSoup(page_data['html'], 'html.parser')
+        soup = BeautifulSoup(page_data['html'], 'lxml')
         
         # Extract basic info
         company_info = {
@@ -143,19 +206,18 @@ class CompanyExtractor:
         if meta_desc and hasattr(meta_desc, 'get'):
             company_info['description'] = meta_desc.get('content', '')  # type: ignore
         
-        # Try to find social media links
-        for link in soup.find_all('a', href=True):
-            try:
-                href = link.get('href', '')  # type: ignore
-                if href and isinstance(href, str):
-                    href_lower = href.lower()
-                    if 'linkedin.com' in href_lower:
-                        company_info['social_media']['linkedin'] = href
-                    elif 'twitter.com' in href_lower or 'x.com' in href_lower:
-                        company_info['social_media']['twitter'] = href
-                    elif 'facebook.com' in href_lower:
-                        company_info['social_media']['facebook'] = href
-            except (AttributeError, TypeError):
-                continue
+        # Try to find social media links; the first link per network wins
+        social_media = company_info['social_media']
+        for match in _SOCIAL_HREF_RE.finditer(page_data['html']):
+            href = html.unescape(match.group(1))
+            href_lower = href.lower()
+            if 'linkedin.com' in href_lower:
+                platform = 'linkedin'
+            elif 'twitter.com' in href_lower or 'x.com' in href_lower:
+                platform = 'twitter'
+            else:
+                platform = 'facebook'
+            if not social_media[platform]:
+                social_media[platform] = href
         
         return company_info 
\ No newline at end of file
@@ -13,6 +13,7 @@ GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.0-flash-lite')
 MAX_PAGES_PER_DOMAIN = 50
 MAX_DEPTH = 3
 REQUEST_DELAY = 1  # seconds between requests
+CRAWL_CONCURRENCY = 5  # pages fetched at once from the same site
 TIMEOUT = 30  # seconds
 
 # User Agents for web scraping
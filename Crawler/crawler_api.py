@@ -5,6 +5,9 @@ Company Crawler API - Function-based interface for the crawler component
 
 import re
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from urllib.parse import urlparse
 from typing import List, Set, Dict, Any, Optional
 
@@ -15,6 +18,17 @@ from .founder_discovery import FounderDiscovery
 from .url_aggregator import URLAggregator
 from .config import GOOGLE_API_KEY, GEMINI_API_KEY, SKIP_URL_WORDS
 
+# Directory holding the per-team URL files (<project root>/data/scrapped_urls)
+_SCRAPPED_URLS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'scrapped_urls')
+
+# URL sets of team files: path -> ((mtime_ns, size), urls); re-read only when the file changes on disk
+URL_SET_CACHE_SIZE = 64
+_url_set_cache: Dict[str, tuple] = {}
+_url_set_lock = threading.Lock()
+
+# URL regex pattern - matches http/https URLs
+_URL_PATTERN = re.compile(r'https?://(?:[-\w.])+(?:[:\d]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:#(?:[\w.])*)?)?')
+
 
 def extract_urls_from_text(text: str) -> Set[str]:
     """
@@ -26,15 +40,9 @@ def extract_urls_from_text(text: str) -> Set[str]:
     Returns:
         Set of unique URLs found in the text
     """
-    # URL regex pattern - matches http/https URLs
-    url_pattern = r'https?://(?:[-\w.])+(?:[:\d]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:#(?:[\w.])*)?)?'
-    
-    # Find all URLs in the text
-    urls = re.findall(url_pattern, text)
-    
-    # Clean and validate URLs
+    # Clean and validate URLs; each distinct match is only checked once
     valid_urls = set()
-    for url in urls:
+    for url in set(_URL_PATTERN.findall(text)):
         # Remove trailing punctuation that might be part of the text
         url = url.rstrip('.,;:!?')
         
@@ -53,12 +61,14 @@ def get_skip_words(user_skip_words: Optional[List[str]] = None) -> List[str]:
     """Merge default skip words with user-provided ones"""
     all_skip_words = list(SKIP_URL_WORDS)  # Copy default list
     if user_skip_words:
-        for word in user_skip_words:
-            if word.lower() not in [w.lower() for w in all_skip_words]:
-                all_skip_words.append(word.lower())
+        seen = frozenset(w.lower() for w in all_skip_words)
+        for word in dict.fromkeys(w.lower() for w in user_skip_words):
+            if word not in seen:
+                all_skip_words.append(word)
     return all_skip_words
 
 
+@lru_cache(maxsize=4096)
 def validate_url(url: str) -> bool:
     """Validate if the provided URL is valid"""
     try:
@@ -176,38 +186,41 @@ def crawl_company(
             else:
                 print("No founders found through search")
         
-        # Step 2: Crawl company website
-        print("Crawling company website...")
-        
-        # Set company info for URL filtering
-        crawler.set_company_info(company_name, company_url)
-        
-        company_pages, blog_posts = crawler.crawl_company_site(company_url, max_pages)
-        
-        aggregator.add_company_pages(company_pages)
-        aggregator.add_blog_posts(blog_posts)
-        
-        # Step 3: Search for founder blogs (if enabled and founders found)
-        if not skip_founder_blogs and founders:
-            print("Searching for founder blogs...")
+        # Steps 2-4 only depend on the company info, so the Google searches for founder blogs
+        # and external mentions run in the background while the website is crawled
+        blog_discovery.set_company_info(company_name, company_url)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # Step 3: Search for founder blogs (if enabled and founders found)
+            founder_blogs_future = None
+            if not skip_founder_blogs and founders:
+                print("Searching for founder blogs...")
+                founder_blogs_future = executor.submit(blog_discovery.search_founder_blogs, company_name, founders)
+            
+            # Step 4: Search for external mentions (if enabled)
+            mentions_future = None
+            if not skip_external:
+                print("Searching for external mentions...")
+                mentions_future = executor.submit(blog_discovery.search_company_mentions, company_name, company_info)
+            
+            # Step 2: Crawl company website
+            print("Crawling company website...")
             
             # Set company info for URL filtering
-            blog_discovery.set_company_info(company_name, company_url)
+            crawler.set_company_info(company_name, company_url)
             
-            founder_blogs = blog_discovery.search_founder_blogs(company_name, founders)
-            aggregator.add_founder_blogs(founder_blogs)
-        
-        # Step 4: Search for external mentions (if enabled)
-        if not skip_external:
-            print("Searching for external mentions...")
+            company_pages, blog_posts = crawler.crawl_company_site(company_url, max_pages)
+            
+            # Aggregate in step order so duplicate URLs keep their original category
+            aggregator.add_company_pages(company_pages)
+            aggregator.add_blog_posts(blog_posts)
             
-            # Set company info for URL filtering (if not already set)
-            if not blog_discovery.company_name:
-                blog_discovery.set_company_info(company_name, company_url)
+            if founder_blogs_future is not None:
+                aggregator.add_founder_blogs(founder_blogs_future.result())
             
-            external_mentions, potential_urls = blog_discovery.search_company_mentions(company_name, company_info)
-            aggregator.add_external_mentions(external_mentions)
-            aggregator.add_potential_urls(potential_urls)
+            if mentions_future is not None:
+                external_mentions, potential_urls = mentions_future.result()
+                aggregator.add_external_mentions(external_mentions)
+                aggregator.add_potential_urls(potential_urls)
         
         # Step 5: Add additional URLs as external mentions
         if all_additional_urls:
@@ -264,6 +277,24 @@ def crawl_company(
         }
 
 
+def _load_url_set(file_path: str) -> Set[str]:
+    """Return the URLs in a team file, reusing the parsed set while the file is unchanged"""
+    st = os.stat(file_path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _url_set_cache.get(file_path)
+    if cached and cached[0] == key:
+        return cached[1]
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        urls = {line.strip() for line in f}
+    urls.discard('')
+    
+    if len(_url_set_cache) >= URL_SET_CACHE_SIZE:
+        _url_set_cache.pop(next(iter(_url_set_cache)), None)
+    _url_set_cache[file_path] = (key, urls)
+    return urls
+
+
 def add_urls_to_existing_file(
     team_id: str,
     additional_urls: Optional[List[str]] = None,
@@ -306,13 +337,7 @@ def add_urls_to_existing_file(
     
     # Find the existing file using team_id
     try:
-        filename = f"{team_id}.txt"
-        
-        # Get the output directory
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(current_dir)
-        output_dir = os.path.join(project_root, 'data', 'scrapped_urls')
-        file_path = os.path.join(output_dir, filename)
+        file_path = os.path.join(_SCRAPPED_URLS_DIR, f"{team_id}.txt")
         
         if not os.path.exists(file_path):
             return {
@@ -320,29 +345,37 @@ def add_urls_to_existing_file(
                 'error': f'No existing file found for team_id: {team_id}'
             }
         
-        # Read existing URLs
-        existing_urls = set()
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                url = line.strip()
-                if url:
-                    existing_urls.add(url)
-        
-        # Find new URLs
-        new_urls = all_additional_urls - existing_urls
-        
-        if not new_urls:
-            return {
-                'success': True,
-                'message': 'All URLs already exist in the file',
-                'urls_added': 0,
-                'file_path': file_path
-            }
-        
-        # Append new URLs to the file
-        with open(file_path, 'a', encoding='utf-8') as f:
-            for url in sorted(new_urls):
-                f.write(f"{url}\n")
+        with _url_set_lock:
+            # Existing URLs are only re-read when the file changed since the last add
+            existing_urls = _load_url_set(file_path)
+            
+            # Find new URLs
+            new_urls = all_additional_urls - existing_urls
+            
+            if not new_urls:
+                return {
+                    'success': True,
+                    'message': 'All URLs already exist in the file',
+                    'urls_added': 0,
+                    'file_path': file_path
+                }
+            
+            # Append new URLs to the file
+            data = ''.join(f"{url}\n" for url in sorted(new_urls)).encode('utf-8')
+            with open(file_path, 'ab') as f:
+                before = os.fstat(f.fileno())
+                f.write(data)
+                f.flush()
+                after = os.fstat(f.fileno())
+            
+            # Crawls in other processes append to the same file, so the cached set is only re-keyed
+            # when the file held exactly what was read plus this append; otherwise it is re-read next time
+            cached_key = _url_set_cache.get(file_path, ((None, None),))[0]
+            if cached_key == (before.st_mtime_ns, before.st_size) and after.st_size == before.st_size + len(data):
+                existing_urls.update(new_urls)
+                _url_set_cache[file_path] = ((after.st_mtime_ns, after.st_size), existing_urls)
+            else:
+                _url_set_cache.pop(file_path, None)
         
         return {
             'success': True,
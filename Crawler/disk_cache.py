@@ -0,0 +1,74 @@
+"""
+Small JSON-file cache with a bounded in-memory front, used for slow external API results
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def make_cache_key(*parts):
+    """Hash the given parts into a short hex key"""
+    return hashlib.blake2b('|'.join(map(str, parts)).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class JsonDiskCache:
+    def __init__(self, directory, ttl, memory_size=1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    def _remember(self, key, expires, value):
+        with self._lock:
+            if key not in self._memory and len(self._memory) >= self.memory_size:
+                self._memory.pop(next(iter(self._memory)))
+            self._memory[key] = (expires, value)
+
+    def get(self, key):
+        """Return the cached value for a key, or None on a miss or expiry"""
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                return entry[1]
+            with self._lock:
+                self._memory.pop(key, None)
+        path = os.path.join(self.directory, f"{key}.json")
+        try:
+            expires = os.path.getmtime(path) + self.ttl
+            if expires <= now:
+                return None
+            with open(path, 'rb') as f:
+                data = f.read()
+            # orjson.JSONDecodeError subclasses ValueError, so the handler below covers both parsers
+            value = orjson.loads(data) if orjson is not None else json.loads(data)
+        except (OSError, ValueError):
+            return None
+        self._remember(key, expires, value)
+        return value
+
+    def set(self, key, value):
+        """Store a JSON-serializable value in memory and on disk"""
+        self._remember(key, time.time() + self.ttl, value)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{key}.json")
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            if orjson is not None:
+                data = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+            else:
+                data = json.dumps(value).encode('utf-8')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Could not write cache entry {key}: {str(e)}")
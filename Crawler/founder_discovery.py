@@ -1,22 +1,64 @@
 import requests
-from bs4 import BeautifulSoup
-from googleapiclient.discovery import build
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree, html as lxml_html
+import itertools
+import logging
+import os
 import random
+import re
 from urllib.parse import urlparse
 from .config import GOOGLE_API_KEY, GOOGLE_CSE_ID, USER_AGENTS, GEMINI_API_KEY, SKIP_URL_WORDS, GEMINI_MODEL
 import google.generativeai as genai
 import json
+from .google_search import google_search_many
+from .disk_cache import JsonDiskCache, make_cache_key
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Candidate team/about pages fetched at once from the company site
+WEBSITE_PROBE_WORKERS = 4
+# Candidate pages are read in chunks and cut off after MAX_PAGE_CHUNKS of them (512 KB)
+PAGE_CHUNK_SIZE = 64 * 1024
+MAX_PAGE_CHUNKS = 8
+
+# Names found on each candidate page (empty for missing pages) are cached for a day
+FOUNDER_PAGE_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'founder_page_cache')
+FOUNDER_PAGE_CACHE_TTL = 24 * 3600
+FOUNDER_PAGE_CACHE_VERSION = 2
+# Only responses saying the page doesn't exist are cached as empty
+DEFINITIVE_MISS_STATUSES = frozenset((404, 410))
+_page_cache = JsonDiskCache(FOUNDER_PAGE_CACHE_DIR, FOUNDER_PAGE_CACHE_TTL)
+
+# Common founder indicators, compiled into one case-insensitive alternation so each
+# text is scanned once without building a lower-cased copy
+FOUNDER_INDICATORS = (
+    'founder', 'co-founder', 'ceo', 'cto', 'coo', 'president',
+    'chief executive', 'chief technology', 'chief operating'
+)
+_FOUNDER_INDICATOR_RE = re.compile('|'.join(map(re.escape, FOUNDER_INDICATORS)), re.IGNORECASE)
+
+# Capitalized words that start sentences rather than names
+_NAME_STOPWORDS = frozenset(['the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'])
+MAX_NAMES_PER_TEXT = 10
 
 class FounderDiscovery:
+    # Common founder page paths probed on the company website
+    FOUNDER_PAGE_PATHS = (
+        '/about',
+        '/team',
+        '/leadership',
+        '/founders',
+        '/about-us',
+        '/our-team',
+        '/company',
+        '/who-we-are'
+    )
+    
     def __init__(self, custom_skip_words=None):
-        self.google_service = None
-        if GOOGLE_API_KEY and GOOGLE_CSE_ID:
-            try:
-                self.google_service = build("customsearch", "v1", developerKey=GOOGLE_API_KEY)
-            except Exception as e:
-                print(f"Error initializing Google Search API: {str(e)}")
-                self.google_service = None
+        # Searches go through the shared REST client in google_search; only its credentials are needed
+        self.search_available = bool(GOOGLE_API_KEY and GOOGLE_CSE_ID)
         
         # Initialize LLM for name extraction
         self.llm = None
@@ -25,13 +67,28 @@ class FounderDiscovery:
                 genai.configure(api_key=GEMINI_API_KEY)  # type: ignore
                 self.llm = genai.GenerativeModel(GEMINI_MODEL)  # type: ignore
             except Exception as e:
-                print(f"Error initializing LLM: {str(e)}")
+                logger.warning(f"Error initializing LLM: {str(e)}")
                 self.llm = None
         
         # Company info for URL filtering
         self.company_name = None
         self.company_url = None
-        self.skip_words = SKIP_URL_WORDS + (custom_skip_words or [])
+        self.skip_words = tuple(dict.fromkeys(word.lower() for word in SKIP_URL_WORDS + (custom_skip_words or [])))
+        
+        # Pooled session so the website probes share keep-alive connections to the one host
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                              max_retries=Retry(total=2, backoff_factor=0.3))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # One user agent per instance: the probes all go to the same host
+        self.session.headers.update({
+            'User-Agent': random.choice(USER_AGENTS),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
     
     def set_company_info(self, company_name, company_url):
         """Set company information for URL filtering"""
@@ -47,9 +104,7 @@ class FounderDiscovery:
         company_name_lower = self.company_name.lower()
         company_url_lower = self.company_url.lower()
         
-        for skip_word in self.skip_words:
-            skip_word_lower = skip_word.lower()
-            
+        for skip_word_lower in self.skip_words:
             # Check if skip word is in the URL
             if skip_word_lower in url_lower:
                 # But don't skip if the word is part of the company name
@@ -67,84 +122,70 @@ class FounderDiscovery:
     
     def search_founders(self, company_name, company_url):
         """Search for company founders using web search and LLM extraction"""
-        print(f"Searching for founders of {company_name}")
+        logger.info(f"Searching for founders of {company_name}")
         
         founders = []
         
         # Method 1: Web search for founders
-        if self.google_service:
+        if self.search_available and self.llm:
             web_founders = self._web_search_founders(company_name, company_url)
             founders.extend(web_founders)
             
             # If we found founders, stop searching
             if founders:
-                print(f"Founders discovered through web search. Stopping search.")
-                # Remove duplicates while preserving order
-                seen = set()
-                unique_founders = []
-                for founder in founders:
-                    if founder.lower() not in seen:
-                        seen.add(founder.lower())
-                        unique_founders.append(founder)
+                logger.info("Founders discovered through web search. Stopping search.")
+                unique_founders = self._dedupe_names(founders)
                 
-                print(f"Found {len(unique_founders)} potential founders: {', '.join(unique_founders)}")
+                logger.info(f"Found {len(unique_founders)} potential founders: {', '.join(unique_founders)}")
                 return unique_founders
         
         # Method 2: Search company website for founder information (fallback)
         # Only if no founders found through web search
         if not founders:
-            print("No founders found through web search, trying company website...")
+            logger.info("No founders found through web search, trying company website...")
             website_founders = self._search_company_website(company_name, company_url)
             founders.extend(website_founders)
         
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_founders = []
-        for founder in founders:
-            if founder.lower() not in seen:
-                seen.add(founder.lower())
-                unique_founders.append(founder)
+        unique_founders = self._dedupe_names(founders)
         
-        print(f"Found {len(unique_founders)} potential founders: {', '.join(unique_founders)}")
+        logger.info(f"Found {len(unique_founders)} potential founders: {', '.join(unique_founders)}")
         return unique_founders
     
+    def _dedupe_names(self, names):
+        """Remove case-insensitive duplicate names while preserving order"""
+        unique = {}
+        for name in names:
+            unique.setdefault(name.lower(), name)
+        return list(unique.values())
+    
     def _web_search_founders(self, company_name, company_url):
         """Search web for founders using Google and extract names with LLM"""
-        print(f"Searching web for founders...")
+        logger.info("Searching web for founders...")
         
         founders = []
         
-        if not self.google_service or not self.llm:
+        if not self.search_available or not self.llm:
             return founders
         
-        # Search queries for founders
+        # Search queries for founders; overlapping phrasings are OR'ed into one query
         search_queries = [
             f"Founders of {company_name}",
-            f"Who founded {company_name}",
-            f"{company_name} founders CEO",
-            f"{company_name} co-founders",
-            f"Who started {company_name}",
-            f"{company_name} leadership team founders"
+            f"Who founded OR started {company_name}",
+            f"{company_name} co-founders OR CEO OR leadership team"
         ]
         
         all_search_results = []
         
-        for query in search_queries:
-            try:
-                results = self._google_search(query, max_results=5)
-                all_search_results.extend(results)
-                
-                # If we have enough results, try to extract founders early
-                if len(all_search_results) >= 10:
-                    early_founders = self._extract_founder_names_with_llm(company_name, all_search_results)
-                    if early_founders:
-                        print(f"Founders found early with query: {query}")
-                        return early_founders
-                
-                time.sleep(2)  # Rate limiting
-            except Exception as e:
-                print(f"Error searching for '{query}': {str(e)}")
-                continue
+        # Run every query concurrently, then consume the results in query order
+        for query, results in zip(search_queries, google_search_many(search_queries, max_results=5)):
+            all_search_results.extend(results)
+            
+            # If we have enough results, try to extract founders early
+            if len(all_search_results) >= 10:
+                early_founders = self._extract_founder_names_with_llm(company_name, all_search_results)
+                if early_founders:
+                    logger.info(f"Founders found early with query: {query}")
+                    return early_founders
         
         if all_search_results:
             # Extract founder names using LLM
@@ -193,166 +234,145 @@ class FounderDiscovery:
                 if isinstance(founder_names, list):
                     return founder_names
                 else:
-                    print("LLM returned non-list response")
+                    logger.warning("LLM returned non-list response")
                     return []
             except json.JSONDecodeError:
-                print("Error parsing LLM response as JSON")
+                logger.warning("Error parsing LLM response as JSON")
                 return []
                 
         except Exception as e:
-            print(f"Error extracting founder names with LLM: {str(e)}")
-            return []
-    
-    def _google_search(self, query, max_results=10):
-        """Perform Google Custom Search"""
-        try:
-            if not self.google_service:
-                return []
-                
-            results = []
-            for i in range(0, min(max_results, 10), 10):
-                try:
-                    search_results = self.google_service.cse().list(
-                        q=query,
-                        cx=GOOGLE_CSE_ID,
-                        start=i + 1
-                    ).execute()
-                    
-                    if 'items' in search_results:
-                        results.extend(search_results['items'])
-                    
-                    if len(results) >= max_results:
-                        break
-                except Exception as e:
-                    print(f"Google search error for query '{query}': {str(e)}")
-                    break
-            
-            return results[:max_results]
-            
-        except Exception as e:
-            print(f"Google search error: {str(e)}")
+            logger.warning(f"Error extracting founder names with LLM: {str(e)}")
             return []
     
     def _search_company_website(self, company_name, company_url):
         """Search company website for founder information (fallback method)"""
-        print(f"Searching company website for founders (fallback)...")
-        
-        founders = []
+        logger.info("Searching company website for founders (fallback)...")
         
         try:
             # Ensure company_url doesn't end with slash
             base_url = company_url.rstrip('/')
             
             # Common founder page URLs
-            founder_urls = [
-                f"{base_url}/about",
-                f"{base_url}/team",
-                f"{base_url}/leadership",
-                f"{base_url}/founders",
-                f"{base_url}/about-us",
-                f"{base_url}/our-team",
-                f"{base_url}/company",
-                f"{base_url}/who-we-are"
-            ]
+            founder_urls = [base_url + path for path in self.FOUNDER_PAGE_PATHS]
             
-            for url in founder_urls:
-                try:
-                    headers = {
-                        'User-Agent': random.choice(USER_AGENTS),
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                        'Accept-Language': 'en-US,en;q=0.5',
-                        'Accept-Encoding': 'gzip, deflate',
-                        'Connection': 'keep-alive',
-                    }
-                    
-                    response = requests.get(url, headers=headers, timeout=30)
-                    response.raise_for_status()
-                    
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Look for founder-related content
-                    page_text = soup.get_text().lower()
-                    
-                    # Common founder indicators
-                    founder_indicators = [
-                        'founder', 'co-founder', 'ceo', 'cto', 'coo', 'president',
-                        'chief executive', 'chief technology', 'chief operating'
-                    ]
-                    
-                    if any(indicator in page_text for indicator in founder_indicators):
-                        # Extract names near founder keywords
-                        names = self._extract_names_near_keywords(soup, founder_indicators)
-                        founders.extend(names)
-                        
-                        # If we found founders, stop searching
-                        if founders:
-                            print(f"Founders found on company website at: {url}")
-                            return founders
-                    
-                    time.sleep(1)  # Rate limiting
-                    
-                except Exception as e:
-                    print(f"Error searching {url}: {str(e)}")
-                    continue
+            # Fetch all candidates concurrently, but take results in list order so the
+            # first page with founders wins exactly as with the sequential probe
+            executor = ThreadPoolExecutor(max_workers=WEBSITE_PROBE_WORKERS)
+            try:
+                futures = [executor.submit(self._fetch_and_scan, url) for url in founder_urls]
+                for url, future in zip(founder_urls, futures):
+                    names = future.result()
+                    if names:
+                        logger.info(f"Founders found on company website at: {url}")
+                        return names
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
             
         except Exception as e:
-            print(f"Error searching company website: {str(e)}")
+            logger.warning(f"Error searching company website: {str(e)}")
         
-        return founders
+        return []
     
-    def _extract_names_near_keywords(self, soup, keywords):
+    def _fetch_and_scan(self, url):
+        """Fetch one candidate page and extract names near founder keywords"""
+        cache_key = make_cache_key(FOUNDER_PAGE_CACHE_VERSION, url)
+        cached_names = _page_cache.get(cache_key)
+        if cached_names is not None:
+            return cached_names
+        
+        try:
+            # Streamed so missing or non-HTML pages are dropped on their status line and
+            # headers alone, without downloading the body (a HEAD probe minus the extra round-trip)
+            with self.session.get(url, timeout=30, stream=True) as response:
+                if response.status_code in DEFINITIVE_MISS_STATUSES:
+                    # Missing pages are remembered too; bot walls, rate limits (403, 429) and
+                    # server errors are transient and retried next run
+                    _page_cache.set(cache_key, [])
+                response.raise_for_status()
+                if 'html' not in response.headers.get('Content-Type', 'text/html').lower():
+                    _page_cache.set(cache_key, [])
+                    return []
+                content = b''.join(itertools.islice(response.iter_content(PAGE_CHUNK_SIZE), MAX_PAGE_CHUNKS))
+            
+            # lxml's own tree keeps parsing and text extraction in C, no bs4 object tree
+            tree = lxml_html.fromstring(content)
+            # Inline scripts and styles are often most of a page's text and never hold names
+            etree.strip_elements(tree, 'script', 'style', with_tail=False)
+            
+            # Extract names near founder keywords; pages without any yield nothing
+            names = self._extract_names_near_keywords(tree, _FOUNDER_INDICATOR_RE)
+            _page_cache.set(cache_key, names)
+            return names
+            
+        except Exception as e:
+            logger.warning(f"Error searching {url}: {str(e)}")
+        
+        return []
+    
+    def _extract_names_near_keywords(self, tree, keyword_re):
         """Extract names that appear near founder keywords"""
         names = []
+        seen_names = set()
+        scanned_parents = set()
         
         try:
-            # Look for text containing founder keywords
-            for keyword in keywords:
-                # Find elements containing the keyword
-                elements = soup.find_all(text=lambda text: text and keyword in text.lower())
+            # One walk over the text nodes, matching every keyword in a single search each
+            for text_node in tree.xpath('//text()'):
+                if not keyword_re.search(text_node):
+                    continue
                 
-                for element in elements:
-                    # Get surrounding text
-                    parent = element.parent
-                    if parent:
-                        text = parent.get_text()
-                        # Extract potential names (simple heuristic)
-                        potential_names = self._extract_names_from_text(text)
-                        names.extend(potential_names)
+                # Get surrounding text; tail text belongs to the element enclosing its owner
+                parent = text_node.getparent()
+                if parent is not None and text_node.is_tail:
+                    parent = parent.getparent()
+                # Sibling matches share a parent, whose text only needs scanning once
+                if parent is not None and parent not in scanned_parents:
+                    scanned_parents.add(parent)
+                    # Extract potential names (simple heuristic)
+                    for name in self._extract_names_from_text(parent.text_content()):
+                        name_lower = name.lower()
+                        if name_lower not in seen_names:
+                            seen_names.add(name_lower)
+                            names.append(name)
             
         except Exception as e:
-            print(f"Error extracting names: {str(e)}")
+            logger.warning(f"Error extracting names: {str(e)}")
         
         return names
     
     def _extract_names_from_text(self, text):
         """Extract potential names from text (simple heuristic)"""
         names = []
+        seen = set()
         
         try:
             # Simple name extraction - look for capitalized words that might be names
             words = text.split()
+            last = len(words) - 1
             
             for i, word in enumerate(words):
                 # Look for patterns like "John Smith" or "Dr. Jane Doe"
-                if (word and word[0].isupper() and 
-                    len(word) > 1 and 
-                    not word.lower() in ['the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by']):
+                if len(word) > 1 and word[0].isupper() and word.lower() not in _NAME_STOPWORDS:
+                    next_word = words[i + 1] if i < last else ''
                     
                     # Check if next word is also capitalized (potential last name)
-                    if (i + 1 < len(words) and 
-                        words[i + 1] and 
-                        words[i + 1][0].isupper() and
-                        len(words[i + 1]) > 1):
-                        
-                        full_name = f"{word} {words[i + 1]}"
-                        if len(full_name) > 3 and full_name not in names:
-                            names.append(full_name)
+                    if len(next_word) > 1 and next_word[0].isupper():
+                        name = f"{word} {next_word}"
                     
                     # Single name (first name only)
-                    elif len(word) > 2 and word not in names:
-                        names.append(word)
+                    elif len(word) > 2:
+                        name = word
+                    else:
+                        continue
+                    
+                    if name not in seen:
+                        seen.add(name)
+                        names.append(name)
+                        # Limit to 10 names to avoid spam; nothing past that is kept
+                        if len(names) >= MAX_NAMES_PER_TEXT:
+                            break
             
         except Exception as e:
-            print(f"Error extracting names from text: {str(e)}")
+            logger.warning(f"Error extracting names from text: {str(e)}")
         
-        return names[:10]  # Limit to 10 names to avoid spam 
\ No newline at end of file
+        return names
@@ -0,0 +1,90 @@
+"""
+Concurrent Google Custom Search queries over the JSON REST endpoint
+"""
+
+import asyncio
+import os
+import aiohttp
+from .config import GOOGLE_API_KEY, GOOGLE_CSE_ID, TIMEOUT
+from .disk_cache import JsonDiskCache, make_cache_key
+
+CSE_ENDPOINT = 'https://www.googleapis.com/customsearch/v1'
+# Requests in flight at once; keeps bursts well inside the per-minute API quota
+CSE_MAX_CONCURRENCY = 4
+# The API never returns more than 10 items per request
+CSE_PAGE_SIZE = 10
+
+# Search results are cached on disk so re-running a company does not re-spend quota;
+# bump CSE_CACHE_VERSION whenever the stored shape or the validators consuming it change
+CSE_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'cse_cache')
+CSE_CACHE_TTL = 30 * 24 * 3600
+CSE_CACHE_VERSION = 1
+_cache = JsonDiskCache(CSE_CACHE_DIR, CSE_CACHE_TTL, memory_size=4096)
+
+
+def get_cached_results(query, num, start=1):
+    """Return cached items for a search request, or None on a miss"""
+    return _cache.get(make_cache_key(CSE_CACHE_VERSION, query, start, num))
+
+
+def cache_results(query, num, start, items):
+    """Store the items for a search request in memory and on disk"""
+    _cache.set(make_cache_key(CSE_CACHE_VERSION, query, start, num), items)
+
+
+async def _search(session, semaphore, query, num, start=1):
+    """Fetch one page of results for a query"""
+    params = {
+        'q': query,
+        'cx': GOOGLE_CSE_ID,
+        'key': GOOGLE_API_KEY,
+        'num': num,
+        'start': start
+    }
+    try:
+        async with semaphore:
+            async with session.get(CSE_ENDPOINT, params=params) as response:
+                response.raise_for_status()
+                data = await response.json()
+        items = data.get('items', [])
+        cache_results(query, num, start, items)
+        return items
+    except Exception as e:
+        print(f"Google search error for {query}: {str(e)}")
+        return []
+
+
+async def _search_all(requests):
+    """Run (query, num, start) requests over one pooled session, serving cache hits without a request"""
+    results = [get_cached_results(*request) for request in requests]
+    misses = [i for i, items in enumerate(results) if items is None]
+    if not misses:
+        return results
+    semaphore = asyncio.Semaphore(CSE_MAX_CONCURRENCY)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+    # Cap the pool at the concurrency limit so every request rides an already-open connection
+    connector = aiohttp.TCPConnector(limit=CSE_MAX_CONCURRENCY)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        fetched = await asyncio.gather(*(_search(session, semaphore, *requests[i]) for i in misses))
+    for i, items in zip(misses, fetched):
+        results[i] = items
+    return results
+
+
+def google_search_many(queries, max_results=10):
+    """Run several Custom Search queries concurrently, returning one result list per query in order"""
+    queries = list(queries)
+    if not (GOOGLE_API_KEY and GOOGLE_CSE_ID) or not queries:
+        return [[] for _ in queries]
+    num = min(max_results, CSE_PAGE_SIZE)
+    results = asyncio.run(_search_all([(query, num, 1) for query in queries]))
+    return [items[:max_results] for items in results]
+
+
+def google_search_pages(query, max_results=50):
+    """Fetch every result page for one query concurrently, returning the combined items"""
+    if not (GOOGLE_API_KEY and GOOGLE_CSE_ID) or max_results <= 0:
+        return []
+    requests = [(query, CSE_PAGE_SIZE, start + 1) for start in range(0, max_results, CSE_PAGE_SIZE)]
+    pages = asyncio.run(_search_all(requests))
+    return [item for page in pages for item in page][:max_results]
@@ -5,6 +5,7 @@ Scrapes company information and discovers related URLs and blogs
 """
 
 import argparse
+import logging
 import sys
 import os
 from urllib.parse import urlparse
@@ -68,6 +69,8 @@ Examples:
 
     # If no subcommand, default to crawl
     args = parser.parse_args()
+    # Founder discovery reports through logging; show it like the rest of the console output
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     if args.command is None:
         args = parser.parse_args(['crawl'] + [a for a in vars(args).values() if isinstance(a, str)])
 
@@ -1,8 +1,34 @@
 import json
+import logging
 from datetime import datetime
+from itertools import chain
 from urllib.parse import urlparse
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Characters that can't appear in a filename component, mapped in one translate pass
+_FNAME_TRANS = str.maketrans({' ': '_', '/': '_', '\\': '_', ':': '_'})
+
+# Fixed pieces of the URL list report, built once rather than on every call
+_REPORT_RULE = "=" * 80 + "\n"
+_SECTION_RULE = "-" * 40 + "\n"
+# The streamed stdlib JSON encoder hands the file thousands of small chunks; a large buffer turns them into a few big writes
+_JSON_WRITE_BUFFER = 1 << 20
+# (category, heading, extra fields printed under each entry) in report order
+_URL_LIST_SECTIONS = (
+    ('company_pages', "1. COMPANY WEBSITE PAGES\n", ()),
+    ('blog_posts', "\n2. BLOG POSTS (Company Website)\n", ()),
+    ('founder_blogs', "\n3. FOUNDER BLOGS\n", ('founder',)),
+    ('external_mentions', "\n4. EXTERNAL MENTIONS\n", ()),
+    ('potential_urls', "\n5. POTENTIAL URLS (LLM Rejected)\n", ()),
+)
+
 class URLAggregator:
     def __init__(self):
         self.all_urls = {
@@ -13,6 +39,14 @@ class URLAggregator:
             'potential_urls': []
         }
         self.company_url = None
+        # Normalized form of every stored URL, maintained by add_* so counting is O(1)
+        self._unique_urls = set()
+        self._indexed_entries = 0
+        # Normalized URLs already stored per category, so add_* can drop repeats on the way in
+        self._category_urls = {category: set() for category in self.all_urls}
+        # Per-instance string pool so a URL or title seen in several categories is stored once
+        # (kept local rather than sys.intern so the strings are freed with the aggregator)
+        self._str_pool = {}
     
     def _normalize_url(self, url: str) -> str:
         """Normalize URL to handle trailing slashes consistently."""
@@ -52,234 +86,199 @@ class URLAggregator:
         output_dir = self._get_output_directory()
         return os.path.join(output_dir, filename)
     
+    def _iter_all_entries(self):
+        """Iterate over the entries of every category in report order"""
+        return chain(self.all_urls['company_pages'],
+                     self.all_urls['blog_posts'],
+                     self.all_urls['founder_blogs'],
+                     self.all_urls['external_mentions'],
+                     self.all_urls['potential_urls'])
+    
     def set_company_url(self, url):
         """Set the company homepage URL for filename generation"""
         self.company_url = url
     
+    def _add_entries(self, category, entries):
+        """Normalize entries' URLs, store them under a category and index them for counting.
+
+        An entry whose normalized URL is already in the same category is dropped, keeping the
+        first one seen; the same URL may still appear once in each of several categories.
+        """
+        category_urls = self._category_urls[category]
+        normalized_entries = []
+        for entry in entries:
+            if isinstance(entry, dict):
+                url = self._normalize_url(entry.get('url', ''))
+                if url in category_urls:
+                    continue
+                category_urls.add(url)
+                normalized_entry = entry.copy()
+                normalized_entry['url'] = self._str_pool.setdefault(url, url)
+                title = normalized_entry.get('title')
+                if isinstance(title, str):
+                    normalized_entry['title'] = self._str_pool.setdefault(title, title)
+                normalized_entries.append(normalized_entry)
+                # add_* already normalized the URL, so it can go straight into the unique set
+                self._unique_urls.add(normalized_entry['url'])
+            else:
+                normalized_entries.append(entry)
+        self.all_urls[category].extend(normalized_entries)
+        self._indexed_entries += len(normalized_entries)
+    
+    def _rebuild_unique(self):
+        """Re-index every stored URL, for when all_urls was changed without the add_* methods"""
+        self._category_urls = {
+            category: {self._normalize_url(item['url']) for item in entries}
+            for category, entries in self.all_urls.items()
+        }
+        self._unique_urls = set().union(*self._category_urls.values())
+        self._indexed_entries = sum(len(entries) for entries in self.all_urls.values())
+    
     def add_company_pages(self, pages):
         """Add company website pages"""
-        # Normalize URLs before adding
-        normalized_pages = []
-        for page in pages:
-            if isinstance(page, dict):
-                normalized_page = page.copy()
-                normalized_page['url'] = self._normalize_url(page.get('url', ''))
-                normalized_pages.append(normalized_page)
-            else:
-                normalized_pages.append(page)
-        self.all_urls['company_pages'].extend(normalized_pages)
+        self._add_entries('company_pages', pages)
     
     def add_blog_posts(self, blogs):
         """Add blog posts from company website"""
-        # Normalize URLs before adding
-        normalized_blogs = []
-        for blog in blogs:
-            if isinstance(blog, dict):
-                normalized_blog = blog.copy()
-                normalized_blog['url'] = self._normalize_url(blog.get('url', ''))
-                normalized_blogs.append(normalized_blog)
-            else:
-                normalized_blogs.append(blog)
-        self.all_urls['blog_posts'].extend(normalized_blogs)
+        self._add_entries('blog_posts', blogs)
     
     def add_founder_blogs(self, founder_blogs):
         """Add blogs written by founders"""
-        # Normalize URLs before adding
-        normalized_blogs = []
-        for blog in founder_blogs:
-            if isinstance(blog, dict):
-                normalized_blog = blog.copy()
-                normalized_blog['url'] = self._normalize_url(blog.get('url', ''))
-                normalized_blogs.append(normalized_blog)
-            else:
-                normalized_blogs.append(blog)
-        self.all_urls['founder_blogs'].extend(normalized_blogs)
+        self._add_entries('founder_blogs', founder_blogs)
     
     def add_external_mentions(self, mentions):
         """Add external mentions of the company"""
-        # Normalize URLs before adding
-        normalized_mentions = []
-        for mention in mentions:
-            if isinstance(mention, dict):
-                normalized_mention = mention.copy()
-                normalized_mention['url'] = self._normalize_url(mention.get('url', ''))
-                normalized_mentions.append(normalized_mention)
-            else:
-                normalized_mentions.append(mention)
-        self.all_urls['external_mentions'].extend(normalized_mentions)
+        self._add_entries('external_mentions', mentions)
     
     def add_potential_urls(self, potential_urls):
         """Add potential URLs that didn't pass LLM validation"""
-        # Normalize URLs before adding
-        normalized_urls = []
-        for potential in potential_urls:
-            if isinstance(potential, dict):
-                normalized_potential = potential.copy()
-                normalized_potential['url'] = self._normalize_url(potential.get('url', ''))
-                normalized_urls.append(normalized_potential)
-            else:
-                normalized_urls.append(potential)
-        self.all_urls['potential_urls'].extend(normalized_urls)
+        self._add_entries('potential_urls', potential_urls)
     
-    def generate_url_list(self, company_name, output_file=None):
-        """Generate a comprehensive URL list file"""
+    def _emit_section(self, parts, heading, entries, extra_keys=()):
+        """Append one report section (heading, then URL, title and any extra fields per entry) to parts"""
+        parts.append(heading)
+        parts.append(_SECTION_RULE)
+        for entry in entries:
+            # One piece per entry; the Title line is still left out when there is no title
+            title = entry.get('title')
+            block = f"URL: {entry['url']}\nTitle: {title}\n" if title else f"URL: {entry['url']}\n"
+            for key in extra_keys:
+                if entry.get(key):
+                    block += f"{key.capitalize()}: {entry[key]}\n"
+            parts.append(block + "\n")
+    
+    def _write_url_list(self, f, company_name, now):
+        """Write the comprehensive URL list to a binary file-like object"""
+        # Build the whole report first and write it as one pre-encoded block, so the
+        # text layer isn't entered once per line
+        parts = []
+        parts.append(f"Company URL Analysis Report\n")
+        parts.append(f"Company: {company_name}\n")
+        parts.append(f"Generated: {now.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        parts.append(_REPORT_RULE + "\n")
+        
+        for category, heading, extra_keys in _URL_LIST_SECTIONS:
+            self._emit_section(parts, heading, self.all_urls[category], extra_keys)
+        
+        # Summary
+        parts.append("\n" + _REPORT_RULE)
+        parts.append("SUMMARY\n")
+        parts.append(_REPORT_RULE)
+        parts.append(f"Total Company Pages: {len(self.all_urls['company_pages'])}\n")
+        parts.append(f"Total Blog Posts: {len(self.all_urls['blog_posts'])}\n")
+        parts.append(f"Total Founder Blogs: {len(self.all_urls['founder_blogs'])}\n")
+        parts.append(f"Total External Mentions: {len(self.all_urls['external_mentions'])}\n")
+        parts.append(f"Total Potential URLs: {len(self.all_urls['potential_urls'])}\n")
+        parts.append(f"GRAND TOTAL: {self.get_total_urls()}\n")
+        
+        f.write(''.join(parts).encode('utf-8'))
+    
+    def generate_url_list(self, company_name, output_file=None, stream=None):
+        """Generate a comprehensive URL list file, or write it to a binary stream when one is given"""
+        # One clock read so the filename and the header carry the same time
+        now = datetime.now()
+        if stream is not None:
+            self._write_url_list(stream, company_name, now)
+            return stream
         if output_file is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{company_name.replace(' ', '_')}_urls_{timestamp}.txt"
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
+            filename = f"{company_name.translate(_FNAME_TRANS)}_urls_{timestamp}.txt"
             output_file = self._get_output_path(filename)
         else:
             # If a custom filename is provided, still save in the output directory
             output_file = self._get_output_path(output_file)
         
-        print(f"Generating URL list: {output_file}")
+        logger.info(f"Generating URL list: {output_file}")
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(f"Company URL Analysis Report\n")
-            f.write(f"Company: {company_name}\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 80 + "\n\n")
-            
-            # Company Pages
-            f.write("1. COMPANY WEBSITE PAGES\n")
-            f.write("-" * 40 + "\n")
-            for page in self.all_urls['company_pages']:
-                f.write(f"URL: {page['url']}\n")
-                if page.get('title'):
-                    f.write(f"Title: {page['title']}\n")
-                f.write("\n")
-            
-            # Blog Posts
-            f.write("\n2. BLOG POSTS (Company Website)\n")
-            f.write("-" * 40 + "\n")
-            for blog in self.all_urls['blog_posts']:
-                f.write(f"URL: {blog['url']}\n")
-                if blog.get('title'):
-                    f.write(f"Title: {blog['title']}\n")
-                f.write("\n")
-            
-            # Founder Blogs
-            f.write("\n3. FOUNDER BLOGS\n")
-            f.write("-" * 40 + "\n")
-            for blog in self.all_urls['founder_blogs']:
-                f.write(f"URL: {blog['url']}\n")
-                if blog.get('title'):
-                    f.write(f"Title: {blog['title']}\n")
-                if blog.get('founder'):
-                    f.write(f"Founder: {blog['founder']}\n")
-                f.write("\n")
-            
-            # External Mentions
-            f.write("\n4. EXTERNAL MENTIONS\n")
-            f.write("-" * 40 + "\n")
-            for mention in self.all_urls['external_mentions']:
-                f.write(f"URL: {mention['url']}\n")
-                if mention.get('title'):
-                    f.write(f"Title: {mention['title']}\n")
-                f.write("\n")
-            
-            # Potential URLs
-            f.write("\n5. POTENTIAL URLS (LLM Rejected)\n")
-            f.write("-" * 40 + "\n")
-            for potential in self.all_urls['potential_urls']:
-                f.write(f"URL: {potential['url']}\n")
-                if potential.get('title'):
-                    f.write(f"Title: {potential['title']}\n")
-                f.write("\n")
-            
-            # Summary
-            f.write("\n" + "=" * 80 + "\n")
-            f.write("SUMMARY\n")
-            f.write("=" * 80 + "\n")
-            f.write(f"Total Company Pages: {len(self.all_urls['company_pages'])}\n")
-            f.write(f"Total Blog Posts: {len(self.all_urls['blog_posts'])}\n")
-            f.write(f"Total Founder Blogs: {len(self.all_urls['founder_blogs'])}\n")
-            f.write(f"Total External Mentions: {len(self.all_urls['external_mentions'])}\n")
-            f.write(f"Total Potential URLs: {len(self.all_urls['potential_urls'])}\n")
-            f.write(f"GRAND TOTAL: {self.get_total_urls()}\n")
+        with open(output_file, 'wb') as f:
+            self._write_url_list(f, company_name, now)
         
-        print(f"URL list saved to: {output_file}")
+        logger.info(f"URL list saved to: {output_file}")
         return output_file
     
-    def generate_simple_url_list(self, company_name, team_id=None, output_file=None):
+    def _write_simple_url_list(self, f, seen_normalized):
+        """Write each URL whose normalized form isn't in seen_normalized to a binary file-like object"""
+        # Walk every category once, keeping each URL the first time its normalized form is seen;
+        # dict.fromkeys drops exact repeats in order first, so each distinct URL is normalized once
+        new_urls = []
+        for url in dict.fromkeys(item['url'] for item in self._iter_all_entries()):
+            normalized_url = self._normalize_url(url)
+            if normalized_url in seen_normalized:
+                continue
+            seen_normalized.add(normalized_url)
+            new_urls.append(url)  # Keep the original URL format
+        
+        # Write the new URLs in one call
+        if new_urls:
+            f.write(('\n'.join(new_urls) + '\n').encode('utf-8'))
+    
+    def generate_simple_url_list(self, company_name, team_id=None, output_file=None, stream=None):
         """Generate a simple list of just URLs, appending to file if it exists, avoiding duplicates."""
+        if stream is not None:
+            # A stream has no earlier contents to dedupe against
+            self._write_simple_url_list(stream, set())
+            return stream
         if output_file is None:
             if team_id:
                 # Use team_id for filename
                 filename = f"{team_id}.txt"
             else:
                 # Fallback to domain-based naming
-                from urllib.parse import urlparse
-                try:
-                    if self.company_url:
-                        parsed_url = urlparse(self.company_url)
-                        domain = parsed_url.netloc
+                filename = f"{company_name.translate(_FNAME_TRANS)}.txt"
+                if self.company_url:
+                    try:
+                        domain = urlparse(self.company_url).netloc
                         filename = f"{domain}.txt"
-                    else:
-                        filename = f"{company_name.replace(' ', '_')}.txt"
-                except:
-                    filename = f"{company_name.replace(' ', '_')}.txt"
+                    except ValueError:
+                        pass
         else:
             filename = output_file
         
         output_file = self._get_output_path(filename)
 
-        print(f"Generating simple URL list: {output_file}")
-
-        # Gather all URLs from the aggregator
-        all_urls = []
-        all_urls.extend([page['url'] for page in self.all_urls['company_pages']])
-        all_urls.extend([blog['url'] for blog in self.all_urls['blog_posts']])
-        all_urls.extend([blog['url'] for blog in self.all_urls['founder_blogs']])
-        all_urls.extend([mention['url'] for mention in self.all_urls['external_mentions']])
-        all_urls.extend([potential['url'] for potential in self.all_urls['potential_urls']])
+        logger.info(f"Generating simple URL list: {output_file}")
 
-        # Remove duplicates using normalized URLs while preserving order
+        # If file exists, seed the seen set with its URLs to avoid duplicates (using normalized comparison)
         seen_normalized = set()
-        unique_urls = []
-        for url in all_urls:
-            normalized_url = self._normalize_url(url)
-            if normalized_url not in seen_normalized:
-                seen_normalized.add(normalized_url)
-                unique_urls.append(url)  # Keep the original URL format
-
-        # If file exists, read existing URLs to avoid duplicates
-        existing_urls = set()
         if os.path.exists(output_file):
             with open(output_file, 'r', encoding='utf-8') as f:
                 for line in f:
                     url = line.strip()
                     if url:
-                        existing_urls.add(url)
+                        seen_normalized.add(self._normalize_url(url))
 
-        # Filter out URLs that are already in the file (using normalized comparison)
-        new_urls = []
-        existing_normalized = {self._normalize_url(url) for url in existing_urls}
-        for url in unique_urls:
-            normalized_url = self._normalize_url(url)
-            if normalized_url not in existing_normalized:
-                new_urls.append(url)
+        # Append to the file (it is still created when there are no new URLs)
+        with open(output_file, 'ab') as f:
+            self._write_simple_url_list(f, seen_normalized)
 
-        # Append new URLs to the file
-        with open(output_file, 'a', encoding='utf-8') as f:
-            for url in new_urls:
-                f.write(f"{url}\n")
-
-        print(f"Simple URL list saved to: {output_file}")
+        logger.info(f"Simple URL list saved to: {output_file}")
         return output_file
     
-    def generate_json_report(self, company_name, output_file=None):
-        """Generate a JSON report with all data"""
-        if output_file is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{company_name.replace(' ', '_')}_report_{timestamp}.json"
-            output_file = self._get_output_path(filename)
-        else:
-            # If a custom filename is provided, still save in the output directory
-            output_file = self._get_output_path(output_file)
-        
+    def _write_json_report(self, f, company_name, now):
+        """Write the JSON report to a binary file-like object"""
         report = {
             'company_name': company_name,
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': now.isoformat(),
             'summary': {
                 'company_pages': len(self.all_urls['company_pages']),
                 'blog_posts': len(self.all_urls['blog_posts']),
@@ -291,34 +290,55 @@ class URLAggregator:
             'urls': self.all_urls
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            # orjson encodes in C, so holding the encoded document for a single write is the cheaper trade
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            # Stream the encoder's chunks so the document is never built as one string
+            for chunk in json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(report):
+                f.write(chunk.encode('utf-8'))
+    
+    def generate_json_report(self, company_name, output_file=None, stream=None):
+        """Generate a JSON report with all data, or write it to a binary stream when one is given"""
+        now = datetime.now()
+        if stream is not None:
+            self._write_json_report(stream, company_name, now)
+            return stream
+        if output_file is None:
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
+            filename = f"{company_name.translate(_FNAME_TRANS)}_report_{timestamp}.json"
+            output_file = self._get_output_path(filename)
+        else:
+            # If a custom filename is provided, still save in the output directory
+            output_file = self._get_output_path(output_file)
         
-        print(f"JSON report saved to: {output_file}")
+        # The streamed stdlib encoder makes many small writes, so give it a large buffer
+        with open(output_file, 'wb', buffering=_JSON_WRITE_BUFFER if orjson is None else -1) as f:
+            self._write_json_report(f, company_name, now)
+        
+        logger.info(f"JSON report saved to: {output_file}")
         return output_file
     
     def get_total_urls(self):
         """Get total number of unique URLs"""
-        all_urls = []
-        all_urls.extend([page['url'] for page in self.all_urls['company_pages']])
-        all_urls.extend([blog['url'] for blog in self.all_urls['blog_posts']])
-        all_urls.extend([blog['url'] for blog in self.all_urls['founder_blogs']])
-        all_urls.extend([mention['url'] for mention in self.all_urls['external_mentions']])
-        all_urls.extend([potential['url'] for potential in self.all_urls['potential_urls']])
-        
-        # Use normalized URLs for accurate counting
-        normalized_urls = {self._normalize_url(url) for url in all_urls}
-        return len(normalized_urls)
+        # Entries appended to all_urls directly haven't been indexed yet
+        if self._indexed_entries != sum(len(entries) for entries in self.all_urls.values()):
+            self._rebuild_unique()
+        return len(self._unique_urls)
     
     def print_summary(self):
         """Print a summary of discovered URLs"""
-        print("\n" + "=" * 60)
-        print("URL DISCOVERY SUMMARY")
-        print("=" * 60)
-        print(f"Company Pages: {len(self.all_urls['company_pages'])}")
-        print(f"Blog Posts: {len(self.all_urls['blog_posts'])}")
-        print(f"Founder Blogs: {len(self.all_urls['founder_blogs'])}")
-        print(f"External Mentions: {len(self.all_urls['external_mentions'])}")
-        print(f"Potential URLs: {len(self.all_urls['potential_urls'])}")
-        print(f"Total Unique URLs: {self.get_total_urls()}")
-        print("=" * 60) 
\ No newline at end of file
+        # The summary is user-facing output, so it goes to stdout whether or not logging is configured,
+        # as one print call
+        print("\n".join([
+            "\n" + "=" * 60,
+            "URL DISCOVERY SUMMARY",
+            "=" * 60,
+            f"Company Pages: {len(self.all_urls['company_pages'])}",
+            f"Blog Posts: {len(self.all_urls['blog_posts'])}",
+            f"Founder Blogs: {len(self.all_urls['founder_blogs'])}",
+            f"External Mentions: {len(self.all_urls['external_mentions'])}",
+            f"Potential URLs: {len(self.all_urls['potential_urls'])}",
+            f"Total Unique URLs: {self.get_total_urls()}",
+            "=" * 60
+        ])) 
\ No newline at end of file
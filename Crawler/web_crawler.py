@@ -1,15 +1,52 @@
 from bs4 import BeautifulSoup
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import re
 from urllib.parse import urljoin, urlparse, urldefrag
 from collections import deque
 import random
-from .config import USER_AGENTS, BLOG_KEYWORDS, MAX_PAGES_PER_DOMAIN, REQUEST_DELAY, TIMEOUT, SKIP_URL_WORDS
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from .config import USER_AGENTS, BLOG_KEYWORDS, MAX_PAGES_PER_DOMAIN, REQUEST_DELAY, TIMEOUT, SKIP_URL_WORDS, CRAWL_CONCURRENCY
 import validators
 import os
 from .blog_discovery import BlogDiscovery
 
+@lru_cache(maxsize=8192)
+def url_netloc(url: str) -> str:
+    """Return the network location of a URL, parsing each distinct URL only once."""
+    return urlparse(url).netloc
+
+
+# Keyword lists checked by is_blog_page, each compiled to one alternation so a string is scanned once
+_BLOG_KEYWORD_RE = re.compile('|'.join(map(re.escape, BLOG_KEYWORDS)))
+_BLOG_INDICATOR_RE = re.compile('published|author|date|read more|continue reading')
+
+
+@lru_cache(maxsize=8192)
+def normalize_url(url: str) -> str:
+    """Normalize URL to handle trailing slashes consistently."""
+    if not url:
+        return url
+    
+    # Parse the URL
+    parsed = urlparse(url)
+    
+    # Normalize the path - remove trailing slash unless it's the root path
+    path = parsed.path
+    if path.endswith('/') and len(path) > 1:
+        path = path.rstrip('/')
+    
+    # Reconstruct the URL
+    normalized = f"{parsed.scheme}://{parsed.netloc}{path}"
+    if parsed.query:
+        normalized += f"?{parsed.query}"
+    if parsed.fragment:
+        normalized += f"#{parsed.fragment}"
+    
+    return normalized
+
 class WebCrawler:
     def __init__(self, custom_skip_words=None):
         self.visited_urls = set()
@@ -17,29 +54,17 @@ class WebCrawler:
         self.blog_urls = []
         self.company_name = None
         self.company_url = None
-        self.skip_words = SKIP_URL_WORDS + (custom_skip_words or [])
+        # Lowercased and deduplicated once so should_skip_url doesn't re-lower per URL
+        self.skip_words = tuple(dict.fromkeys(word.lower() for word in SKIP_URL_WORDS + (custom_skip_words or [])))
+        # Keep-alive pool sized for one crawl wave, since every request in it goes to the same host
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=CRAWL_CONCURRENCY)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
     def _normalize_url(self, url: str) -> str:
         """Normalize URL to handle trailing slashes consistently."""
-        if not url:
-            return url
-        
-        # Parse the URL
-        parsed = urlparse(url)
-        
-        # Normalize the path - remove trailing slash unless it's the root path
-        path = parsed.path
-        if path.endswith('/') and len(path) > 1:
-            path = path.rstrip('/')
-        
-        # Reconstruct the URL
-        normalized = f"{parsed.scheme}://{parsed.netloc}{path}"
-        if parsed.query:
-            normalized += f"?{parsed.query}"
-        if parsed.fragment:
-            normalized += f"#{parsed.fragment}"
-        
-        return normalized
+        return normalize_url(url)
         
     def set_company_info(self, company_name, company_url):
         """Set company information for URL filtering"""
@@ -55,9 +80,7 @@ class WebCrawler:
         company_name_lower = self.company_name.lower()
         company_url_lower = self.company_url.lower()
         
-        for skip_word in self.skip_words:
-            skip_word_lower = skip_word.lower()
-            
+        for skip_word_lower in self.skip_words:
             # Check if skip word is in the URL
             if skip_word_lower in url_lower:
                 # But don't skip if the word is part of the company name
@@ -76,9 +99,7 @@ class WebCrawler:
     def is_same_domain(self, url, base_url):
         """Check if URL belongs to the same domain as base URL"""
         try:
-            base_domain = urlparse(base_url).netloc
-            url_domain = urlparse(url).netloc
-            return base_domain == url_domain
+            return url_netloc(base_url) == url_netloc(url)
         except:
             return False
     
@@ -95,21 +116,13 @@ class WebCrawler:
         title_lower = title.lower() if title else ""
         content_lower = content.lower() if content else ""
         
-        # Check URL for blog keywords
-        for keyword in BLOG_KEYWORDS:
-            if keyword in url_lower:
-                return True
-        
-        # Check title for blog keywords
-        for keyword in BLOG_KEYWORDS:
-            if keyword in title_lower:
-                return True
+        # Check URL and title for blog keywords
+        if _BLOG_KEYWORD_RE.search(url_lower) or _BLOG_KEYWORD_RE.search(title_lower):
+            return True
         
         # Check content for blog indicators
-        blog_indicators = ['published', 'author', 'date', 'read more', 'continue reading']
-        for indicator in blog_indicators:
-            if indicator in content_lower:
-                return True
+        if _BLOG_INDICATOR_RE.search(content_lower):
+            return True
         
         return False
     
@@ -124,7 +137,7 @@ class WebCrawler:
                 'Connection': 'keep-alive',
             }
             
-            response = requests.get(url, headers=headers, timeout=TIMEOUT)
+            response = self.session.get(url, headers=headers, timeout=TIMEOUT)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -173,48 +186,58 @@ class WebCrawler:
         print(f"Starting crawl of company site: {start_url}")
         
         queue = deque([start_url])
+        # Normalized form of every URL ever queued, so new links are checked in O(1)
+        queued_urls = {self._normalize_url(start_url)}
         self.visited_urls = set()
         self.found_urls = []
         self.blog_urls = []
         
-        while queue and len(self.found_urls) < max_pages:
-            current_url = queue.popleft()
-            
-            # Use normalized URL for visited check
-            normalized_current_url = self._normalize_url(current_url)
-            if normalized_current_url in self.visited_urls:
-                continue
-            
-            self.visited_urls.add(normalized_current_url)
-            
-            # Only crawl URLs from the same domain
-            if not self.is_same_domain(current_url, start_url):
-                continue
-            
-            print(f"Crawling: {current_url}")
-            
-            links, title, content = self.get_page_links(current_url)
-            
-            # Add current URL to found URLs
-            self.found_urls.append({
-                'url': current_url,
-                'title': title,
-                'type': 'page'
-            })
-            
-            # Add new links to queue (using normalized URLs for deduplication)
-            seen_normalized = {self._normalize_url(link) for link in queue}
-            for link in links:
-                normalized_link = self._normalize_url(link)
-                if (normalized_link not in self.visited_urls and 
-                    normalized_link not in seen_normalized and
-                    self.is_same_domain(link, start_url) and
-                    len(self.found_urls) < max_pages):
-                    queue.append(link)
-                    seen_normalized.add(normalized_link)
-            
-            # Respect rate limiting
-            time.sleep(REQUEST_DELAY)
+        with ThreadPoolExecutor(max_workers=CRAWL_CONCURRENCY) as executor:
+            while queue and len(self.found_urls) < max_pages:
+                # Take the next wave of pages from the queue and fetch them together
+                batch = []
+                wave_size = min(CRAWL_CONCURRENCY, max_pages - len(self.found_urls))
+                while queue and len(batch) < wave_size:
+                    current_url = queue.popleft()
+                    
+                    # Use normalized URL for visited check
+                    normalized_current_url = self._normalize_url(current_url)
+                    if normalized_current_url in self.visited_urls:
+                        continue
+                    
+                    self.visited_urls.add(normalized_current_url)
+                    
+                    # Only crawl URLs from the same domain
+                    if not self.is_same_domain(current_url, start_url):
+                        continue
+                    
+                    print(f"Crawling: {current_url}")
+                    batch.append(current_url)
+                
+                if not batch:
+                    continue
+                
+                # Results come back in queue order, so the crawl stays breadth-first
+                for current_url, (links, title, content) in zip(batch, executor.map(self.get_page_links, batch)):
+                    # Add current URL to found URLs
+                    self.found_urls.append({
+                        'url': current_url,
+                        'title': title,
+                        'type': 'page'
+                    })
+                    
+                    # Add new links to queue (using normalized URLs for deduplication)
+                    for link in links:
+                        normalized_link = self._normalize_url(link)
+                        if (normalized_link not in self.visited_urls and 
+                            normalized_link not in queued_urls and
+                            self.is_same_domain(link, start_url) and
+                            len(self.found_urls) < max_pages):
+                            queue.append(link)
+                            queued_urls.add(normalized_link)
+                
+                # Respect rate limiting between waves
+                time.sleep(REQUEST_DELAY)
         
         print(f"Crawl completed. Found {len(self.found_urls)} pages and {len(self.blog_urls)} blog posts.")
         return self.found_urls, self.blog_urls
@@ -234,6 +257,7 @@ def crawl_trusted_base_urls(base_urls, skip_words=None, max_pages_per_domain=50,
     if skip_words is None:
         from .config import SKIP_URL_WORDS
         skip_words = SKIP_URL_WORDS
+    skip_words = tuple(dict.fromkeys(word.lower() for word in skip_words))
 
     # Always crawl the homepage if no base_urls are provided
     if not base_urls or len(base_urls) == 0:
@@ -254,16 +278,11 @@ def crawl_trusted_base_urls(base_urls, skip_words=None, max_pages_per_domain=50,
     
     def should_skip_url_simple(url, skip_words):
         url_lower = url.lower()
-        for skip_word in skip_words:
-            if skip_word.lower() in url_lower:
-                return True
-        return False
+        return any(skip_word in url_lower for skip_word in skip_words)
 
     def is_same_domain(url, base_url):
         try:
-            base_domain = urlparse(base_url).netloc
-            url_domain = urlparse(url).netloc
-            return base_domain == url_domain
+            return url_netloc(base_url) == url_netloc(url)
         except:
             return False
 
@@ -278,6 +297,7 @@ def crawl_trusted_base_urls(base_urls, skip_words=None, max_pages_per_domain=50,
         print(f"Crawling trusted base URL: {base_url}")
         visited_urls = set()
         queue = deque([base_url])
+        queued_urls = {normalize_url(base_url)}
         found_urls = set()
         is_blog_root = base_url.rstrip('/')
         # Supplement with Google search if blog root
@@ -292,24 +312,11 @@ def crawl_trusted_base_urls(base_urls, skip_words=None, max_pages_per_domain=50,
             for url in google_blog_urls:
                 if url not in visited_urls:
                     queue.append(url)
+                    queued_urls.add(normalize_url(url))
         except Exception as e:
             print(f"Error using Google search for blog subpages: {e}")
         while queue and len(found_urls) < max_pages_per_domain:
             current_url = queue.popleft()
-            def normalize_url(url: str) -> str:
-                if not url:
-                    return url
-                parsed = urlparse(url)
-                path = parsed.path
-                if path.endswith('/') and len(path) > 1:
-                    path = path.rstrip('/')
-                normalized = f"{parsed.scheme}://{parsed.netloc}{path}"
-                if parsed.query:
-                    normalized += f"?{parsed.query}"
-                if parsed.fragment:
-                    normalized += f"#{parsed.fragment}"
-                return normalized
-
             normalized_current_url = normalize_url(current_url)
             if normalized_current_url in visited_urls:
                 continue
@@ -349,10 +356,11 @@ def crawl_trusted_base_urls(base_urls, skip_words=None, max_pages_per_domain=50,
                 for link in links:
                     normalized_link = normalize_url(link)
                     if (normalized_link not in visited_urls and
-                        normalized_link not in queue and
+                        normalized_link not in queued_urls and
                         is_same_domain(link, base_url) and
                         len(found_urls) < max_pages_per_domain):
                         queue.append(link)
+                        queued_urls.add(normalized_link)
                 time.sleep(REQUEST_DELAY)
             except Exception as e:
                 print(f"Error fetching {current_url}: {str(e)}")
@@ -361,8 +369,7 @@ def crawl_trusted_base_urls(base_urls, skip_words=None, max_pages_per_domain=50,
     # Save to file only if output_file is provided
     if output_file is not None:
         with open(output_file, 'a', encoding='utf-8') as f:
-            for url in sorted(all_discovered_urls):
-                f.write(url + '\n')
+            f.write(''.join(url + '\n' for url in sorted(all_discovered_urls)))
         print(f"Trusted base URLs crawl complete. {len(all_discovered_urls)} unique URLs appended to {output_file}")
     else:
         print(f"Trusted base URLs crawl complete. {len(all_discovered_urls)} unique URLs discovered (no file written)")
@@ -15,6 +15,8 @@ class Config:
     
     # Web Scraping Configuration
     MAX_CONCURRENT_REQUESTS = int(os.getenv('MAX_CONCURRENT_REQUESTS', '10'))
+    # Worker threads for the threading processing mode; matches the ThreadPoolExecutor default
+    MAX_WORKER_THREADS = int(os.getenv('MAX_WORKER_THREADS', str(min(32, (os.cpu_count() or 1) * 5))))
     REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '30'))
     USER_AGENT = os.getenv('USER_AGENT', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
     
@@ -22,11 +24,12 @@ class Config:
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', '100000'))
     CHUNK_SIZE = int(os.getenv('CHUNK_SIZE', '10000'))  # Size of each chunk in characters
     CHUNK_OVERLAP = int(os.getenv('CHUNK_OVERLAP', '100'))  # Overlap between chunks to maintain context
-    SUPPORTED_CONTENT_TYPES = [
+    MAX_CONCURRENT_CHUNKS = int(os.getenv('MAX_CONCURRENT_CHUNKS', '4'))  # Chunks of one document sent to the LLM at once
+    SUPPORTED_CONTENT_TYPES = frozenset([
         'text/html',
         'application/pdf',
         'text/plain'
-    ]
+    ])
     
     # File Paths
     OUTPUT_DIR = os.getenv('OUTPUT_DIR', 'output')
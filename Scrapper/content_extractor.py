@@ -11,6 +11,17 @@ import urllib.parse
 
 from config import Config
 
+_GOOGLE_DRIVE_HOST_RE = re.compile(r'drive\.google\.com|docs\.google\.com')
+# Tried in order; the first pattern that matches supplies the file ID
+_GOOGLE_DRIVE_FILE_ID_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'/file/d/([a-zA-Z0-9_-]+)',
+    r'/document/d/([a-zA-Z0-9_-]+)',
+    r'/presentation/d/([a-zA-Z0-9_-]+)',
+    r'/spreadsheets/d/([a-zA-Z0-9_-]+)',
+    r'id=([a-zA-Z0-9_-]+)',
+    r'/d/([a-zA-Z0-9_-]+)'
+))
+
 class ContentExtractor:
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
@@ -29,25 +40,13 @@ class ContentExtractor:
     
     def _is_google_drive_url(self, url: str) -> bool:
         """Check if URL is a Google Drive link."""
-        return any(domain in url.lower() for domain in [
-            'drive.google.com',
-            'docs.google.com'
-        ])
+        return _GOOGLE_DRIVE_HOST_RE.search(url.lower()) is not None
     
     def _extract_google_drive_file_id(self, url: str) -> Optional[str]:
         """Extract file ID from Google Drive URL."""
         # Handle different Google Drive URL formats
-        patterns = [
-            r'/file/d/([a-zA-Z0-9_-]+)',
-            r'/document/d/([a-zA-Z0-9_-]+)',
-            r'/presentation/d/([a-zA-Z0-9_-]+)',
-            r'/spreadsheets/d/([a-zA-Z0-9_-]+)',
-            r'id=([a-zA-Z0-9_-]+)',
-            r'/d/([a-zA-Z0-9_-]+)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in _GOOGLE_DRIVE_FILE_ID_PATTERNS:
+            match = pattern.search(url)
             if match:
                 return match.group(1)
         
@@ -434,7 +433,7 @@ class ContentExtractor:
             
             # If no title from metadata, try to extract from first page
             if not title and content:
-                first_line = content.split('\n')[0].strip()
+                first_line = content.partition('\n')[0].strip()
                 if len(first_line) < 100:  # Reasonable title length
                     title = first_line
             
@@ -456,8 +455,7 @@ class ContentExtractor:
         content = self._clean_text(content)
         
         # Try to extract title from first line
-        lines = content.split('\n')
-        title = lines[0].strip() if lines else ""
+        title = content.partition('\n')[0].strip()
         
         return {
             'url': url,
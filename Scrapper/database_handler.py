@@ -1,10 +1,11 @@
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set
 from pymongo import MongoClient
 from pymongo.errors import DuplicateKeyError, ConnectionFailure
 import json
 from datetime import datetime, timezone
 import asyncio
+import atexit
 import threading
 
 from config import Config
@@ -36,6 +37,9 @@ class DatabaseHandler:
                     )
                     cls.logger = logging.getLogger(__name__)
                     cls.logger.info("Created MongoDB connection pool with maxPoolSize=50, minPoolSize=10")
+                    # Scrapes and knowledge lookups running side by side in one process all share
+                    # this client, so it is closed once at interpreter exit rather than per scraper
+                    atexit.register(cls.close_connection_pool)
         return cls._connection_pool
     
     @classmethod
@@ -198,6 +202,24 @@ class DatabaseHandler:
             self.logger.error(f"Error retrieving team knowledge: {e}")
             return None
     
+    async def get_team_source_urls(self, team_id: str) -> Set[str]:
+        """Retrieve the source URLs of a team's knowledge items without loading their content."""
+        try:
+            if self.collection is None:
+                raise Exception("Database not connected")
+            
+            team_document = self.collection.find_one(
+                {"team_id": team_id},
+                {"_id": 0, "items.source_url": 1}
+            )
+            if not team_document:
+                return set()
+            return {item['source_url'] for item in team_document.get('items', []) if item.get('source_url')}
+            
+        except Exception as e:
+            self.logger.error(f"Error retrieving team source URLs: {e}")
+            return set()
+    
     async def search_knowledge(self, team_id: str, query: str) -> List[Dict[str, Any]]:
         """Search knowledge items within a team."""
         try:
@@ -5,9 +5,50 @@ from google.generativeai.client import configure
 import json
 import re
 import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
 
 from config import Config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads_json(text: str) -> Any:
+    """Parse JSON text, using orjson when it is installed (its decode error subclasses json.JSONDecodeError)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+# Substring checks used by validate_content, compiled to one alternation each so
+# the content is scanned once instead of once per keyword
+TECHNICAL_KEYWORDS = [
+    'api', 'code', 'programming', 'development', 'software', 'technology',
+    'algorithm', 'database', 'framework', 'library', 'function', 'class',
+    'method', 'variable', 'loop', 'condition', 'error', 'debug', 'test',
+    'deploy', 'server', 'client', 'frontend', 'backend',
+    'security', 'performance', 'optimization', 'architecture', 'design',
+    'interview', 'coding', 'technical', 'computer', 'system', 'application',
+    'data', 'analysis', 'machine', 'learning', 'artificial', 'intelligence',
+    'web', 'mobile', 'cloud', 'network', 'protocol', 'interface'
+]
+TECHNICAL_INDICATORS = [
+    'chapter', 'section', 'problem', 'solution', 'example', 'implementation',
+    'design', 'pattern', 'structure', 'model', 'approach', 'methodology',
+    'practice', 'principle', 'concept', 'theory', 'framework', 'architecture'
+]
+_TECHNICAL_KEYWORD_RE = re.compile('|'.join(map(re.escape, TECHNICAL_KEYWORDS)))
+_TECHNICAL_INDICATOR_RE = re.compile('|'.join(map(re.escape, TECHNICAL_INDICATORS)))
+
+# Knowledge-extraction responses keyed by SHA-256 of model and prompt. The prompt holds no
+# team or user IDs, so the same page extracted for another user reuses the Gemini answer
+EXTRACTION_CACHE_SIZE = 1024
+_extraction_cache: "OrderedDict[str, str]" = OrderedDict()
+_extraction_cache_lock = threading.Lock()
+
 class LLMProcessor:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -19,6 +60,28 @@ class LLMProcessor:
         configure(api_key=Config.GEMINI_API_KEY)
         self.model = GenerativeModel(Config.GEMINI_MODEL)
     
+    async def _generate_content(self, prompt: str):
+        """Run a blocking Gemini call in a worker thread so concurrent calls overlap."""
+        return await asyncio.to_thread(self.model.generate_content, prompt)
+    
+    async def _generate_text_cached(self, prompt: str) -> str:
+        """Return the response text for a prompt, reusing an earlier answer to the identical prompt."""
+        key = hashlib.sha256(f"{Config.GEMINI_MODEL}|{prompt}".encode('utf-8')).hexdigest()
+        with _extraction_cache_lock:
+            text = _extraction_cache.get(key)
+            if text is not None:
+                _extraction_cache.move_to_end(key)
+                return text
+        
+        response = await self._generate_content(prompt)
+        text = response.text
+        if text:
+            with _extraction_cache_lock:
+                _extraction_cache[key] = text
+                if len(_extraction_cache) > EXTRACTION_CACHE_SIZE:
+                    _extraction_cache.popitem(last=False)
+        return text
+    
     async def process_content(self, content_data: Dict[str, Any], team_id: str, user_id: str = "") -> Optional[Dict[str, Any]]:
         """Process content through LLM to extract structured knowledge."""
         try:
@@ -67,29 +130,36 @@ class LLMProcessor:
             else:
                 self.logger.warning("Failed to extract metadata from first chunk, using original values")
             
-            # Process all chunks for content extraction
-            chunk_results = []
-            for i, chunk in enumerate(chunks):
-                self.logger.info(f"Processing chunk {i+1}/{len(chunks)}")
-                
-                chunk_data = {
-                    **content_data,
-                    'content': chunk,
-                    'title': title,  # Use consistent title
-                    'content_type': content_type,  # Use consistent content_type
-                    'author': author  # Use consistent author
-                }
-                
-                # Convert chunk to markdown
-                chunk_markdown = await self._convert_to_markdown(chunk_data)
-                
-                # Extract structured content from chunk
-                chunk_structured = await self._extract_structured_content_only(chunk_data, chunk_markdown)
-                if chunk_structured:
-                    chunk_results.append({
-                        'markdown': chunk_markdown,
-                        'structured': chunk_structured
-                    })
+            # Bound the LLM calls one document has in flight so long documents stay under the rate limits
+            chunk_semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_CHUNKS)
+            
+            async def process_chunk(i: int, chunk: str) -> Optional[Dict[str, str]]:
+                async with chunk_semaphore:
+                    self.logger.info(f"Processing chunk {i+1}/{len(chunks)}")
+                    
+                    chunk_data = {
+                        **content_data,
+                        'content': chunk,
+                        'title': title,  # Use consistent title
+                        'content_type': content_type,  # Use consistent content_type
+                        'author': author  # Use consistent author
+                    }
+                    
+                    # Convert chunk to markdown
+                    chunk_markdown = await self._convert_to_markdown(chunk_data)
+                    
+                    # Extract structured content from chunk
+                    chunk_structured = await self._extract_structured_content_only(chunk_data, chunk_markdown)
+                    if chunk_structured:
+                        return {
+                            'markdown': chunk_markdown,
+                            'structured': chunk_structured
+                        }
+                    return None
+            
+            # Chunks only depend on the shared metadata, so process them concurrently, a few at a time (results keep chunk order)
+            results = await asyncio.gather(*(process_chunk(i, chunk) for i, chunk in enumerate(chunks)))
+            chunk_results = [result for result in results if result]
             
             if not chunk_results:
                 self.logger.warning("No valid chunks processed")
@@ -200,7 +270,7 @@ class LLMProcessor:
             - If any field cannot be determined, use the original value or empty string. Do not fail completely.
             """
             
-            response = self.model.generate_content(prompt)
+            response = await self._generate_content(prompt)
             
             if not response.text:
                 # Return original values if LLM fails
@@ -228,7 +298,7 @@ class LLMProcessor:
                     # Clean the response using existing function
                     cleaned_response = self._clean_llm_response(response_text)
                     
-                    json_data = json.loads(cleaned_response)
+                    json_data = loads_json(cleaned_response)
                     
                     extracted_title = json_data.get('title', title)
                     extracted_content_type = json_data.get('content_type', content_type)
@@ -287,7 +357,7 @@ class LLMProcessor:
             Focus on the technical content present in this specific chunk.
             """
             
-            response = self.model.generate_content(prompt)
+            response = await self._generate_content(prompt)
             
             if response.text:
                 return response.text.strip()
@@ -334,7 +404,7 @@ class LLMProcessor:
             Return only the markdown-formatted content without any additional text or explanations.
             """
             
-            response = self.model.generate_content(prompt)
+            response = await self._generate_content(prompt)
             
             if response.text:
                 return response.text.strip()
@@ -417,12 +487,12 @@ class LLMProcessor:
             - If any metadata field cannot be determined, use the original value or empty string. Do not fail completely.
             """
             
-            response = self.model.generate_content(prompt)
+            response_text = await self._generate_text_cached(prompt)
             
-            if not response.text:
+            if not response_text:
                 return None
             
-            response_text = response.text.strip()
+            response_text = response_text.strip()
             
             # Check if content is not technical
             if response_text == "NOT_TECHNICAL":
@@ -472,7 +542,7 @@ class LLMProcessor:
                 # Clean the response using existing function
                 cleaned_response = self._clean_llm_response(response_text)
                 
-                json_data = json.loads(cleaned_response)
+                json_data = loads_json(cleaned_response)
                 
                 extracted_title = json_data.get('title', title)
                 extracted_content_type = json_data.get('content_type', content_type)
@@ -518,8 +588,8 @@ class LLMProcessor:
             fallback_title = title
             if not fallback_title or len(fallback_title.strip()) < 3:
                 # Try to extract title from first few lines of content
-                content_lines = markdown_content.split('\n')
-                for line in content_lines[:5]:  # Check first 5 lines
+                content_lines = markdown_content.splitlines()[:5]
+                for line in content_lines:  # Check first 5 lines
                     line = line.strip()
                     if line and len(line) > 5 and len(line) < 100:
                         # Remove markdown formatting
@@ -580,19 +650,7 @@ class LLMProcessor:
                 return False
             
             # Check for technical keywords
-            technical_keywords = [
-                'api', 'code', 'programming', 'development', 'software', 'technology',
-                'algorithm', 'database', 'framework', 'library', 'function', 'class',
-                'method', 'variable', 'loop', 'condition', 'error', 'debug', 'test',
-                'deploy', 'server', 'client', 'frontend', 'backend', 'database',
-                'security', 'performance', 'optimization', 'architecture', 'design',
-                'interview', 'coding', 'technical', 'computer', 'system', 'application',
-                'data', 'analysis', 'machine', 'learning', 'artificial', 'intelligence',
-                'web', 'mobile', 'cloud', 'network', 'protocol', 'interface'
-            ]
-            
-            content_lower = content.lower()
-            has_technical_content = any(keyword in content_lower for keyword in technical_keywords)
+            has_technical_content = _TECHNICAL_KEYWORD_RE.search(content.lower()) is not None
             
             # If we have technical content, accept it regardless of title
             if has_technical_content:
@@ -607,12 +665,7 @@ class LLMProcessor:
             if not title or len(title) < 5:
                 # Look for any technical indicators in the first 2000 characters
                 sample_content = content[:5000].lower()
-                technical_indicators = [
-                    'chapter', 'section', 'problem', 'solution', 'example', 'implementation',
-                    'design', 'pattern', 'structure', 'model', 'approach', 'methodology',
-                    'practice', 'principle', 'concept', 'theory', 'framework', 'architecture'
-                ]
-                has_indicators = any(indicator in sample_content for indicator in technical_indicators)
+                has_indicators = _TECHNICAL_INDICATOR_RE.search(sample_content) is not None
                 if has_indicators and len(content) > 1000:
                     return True
             
@@ -1,4 +1,5 @@
 import multiprocessing as mp
+from multiprocessing.util import Finalize
 import logging
 import os
 import sys
@@ -6,18 +7,22 @@ from typing import List, Dict, Any, Set
 import argparse
 from pathlib import Path
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import asyncio
+import threading
 from logging.handlers import QueueHandler, QueueListener
 
-# Add the current directory to Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Add the current directory to Python path (once, so repeated imports don't grow the search path)
+_module_dir = os.path.dirname(os.path.abspath(__file__))
+if _module_dir not in sys.path:
+    sys.path.append(_module_dir)
 
 from url_processor import URLProcessor
 from content_extractor import ContentExtractor
 from llm_processor import LLMProcessor
 from database_handler import DatabaseHandler
 from config import Config
+import aiohttp
 
 def setup_logging_queue(logfile=None):
     """Setup multiprocessing-safe logging to a single file."""
@@ -50,10 +55,10 @@ def worker_init_logging(log_queue):
     logging.getLogger('asyncio').setLevel(logging.WARNING)
 
 class KnowledgeScraper:
-    def __init__(self, team_id: str, user_id: str = "", processing_mode: str = "multiprocessing", skip_existing_urls: bool = False, log_queue=None):
+    def __init__(self, team_id: str, user_id: str = "", processing_mode: str = "threading", skip_existing_urls: bool = False, log_queue=None):
         self.team_id = team_id
         self.user_id = user_id
-        self.processing_mode = processing_mode.lower()  # "multiprocessing" or "async"
+        self.processing_mode = processing_mode.lower()  # "threading", "multiprocessing" or "async"
         self.skip_existing_urls = skip_existing_urls  # New parameter to skip URLs already in DB
         self.logger = logging.getLogger(__name__)
         self.log_queue = log_queue
@@ -77,11 +82,18 @@ class KnowledgeScraper:
         
         # Cache for existing URLs from database
         self.existing_urls_from_db: Set[str] = set()
+        self.existing_urls_loaded = False
         
         # Process pool for parallel processing (only for multiprocessing mode)
         self.process_pool = None
         self.max_workers = min(Config.MAX_CONCURRENT_REQUESTS, mp.cpu_count())
         
+        # Thread pool for parallel processing (only for threading mode); the per-URL work is
+        # dominated by HTTP and LLM API waits, so threads avoid process startup and result pickling
+        self.thread_pool = None
+        self.thread_sessions = None
+        self.max_threads = Config.MAX_WORKER_THREADS
+        
         # Async components (only for async mode)
         self.url_processor = None
         self.content_extractor = None
@@ -100,6 +112,13 @@ class KnowledgeScraper:
                 )
             else:
                 self.process_pool = mp.get_context("spawn").Pool(processes=self.max_workers)
+        elif self.processing_mode == "threading":
+            self.thread_pool = ThreadPoolExecutor(max_workers=self.max_threads)
+            # Sessions belong to this scraper's pool so other scrapes running alongside keep theirs
+            self.thread_sessions = WorkerSessionPool()
+        
+        # Load existing URLs once so workers don't each query the database per URL
+        self._load_existing_urls_from_db_sync()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -107,9 +126,11 @@ class KnowledgeScraper:
         if self.processing_mode == "multiprocessing" and self.process_pool:
             self.process_pool.close()
             self.process_pool.join()
-        
-        # Clean up shared database connection pool
-        DatabaseHandler.close_connection_pool()
+        if self.thread_pool:
+            self.thread_pool.shutdown(wait=True)
+            self.thread_sessions.close()
+        # The shared database connection pool stays open: other scrapes in this process may still
+        # be using it, and DatabaseHandler closes it at process exit
     
     async def __aenter__(self):
         """Initialize async components."""
@@ -119,8 +140,10 @@ class KnowledgeScraper:
             self.llm_processor = LLMProcessor()
             self.db_handler = DatabaseHandler()
             
-            await self.url_processor.__aenter__()
-            await self.content_extractor.__aenter__()
+            # Discovery and extraction fetch the same pages, so they share one connection pool
+            session = await create_http_session()
+            self.url_processor.session = session
+            self.content_extractor.session = session
             await self.db_handler.connect()
             
             # Load existing URLs from database if skip_existing_urls is enabled
@@ -136,9 +159,7 @@ class KnowledgeScraper:
                 await self.content_extractor.__aexit__(exc_type, exc_val, exc_tb)
             if self.db_handler:
                 await self.db_handler.disconnect()
-        
-        # Clean up shared database connection pool
-        DatabaseHandler.close_connection_pool()
+        # The shared database connection pool stays open for other scrapes; it is closed at process exit
     
     def _get_subpage_file_path(self, original_file_path: str) -> str:
         """Generate subpage file path based on original file path."""
@@ -205,9 +226,11 @@ class KnowledgeScraper:
     def _delete_subpage_file(self, file_path: str):
         """Delete subpage file after processing is complete."""
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                self.logger.info(f"DELETED subpage file: {os.path.basename(file_path)}")
+            # Remove directly rather than stat first; a missing file just means nothing to clean up
+            os.remove(file_path)
+            self.logger.info(f"DELETED subpage file: {os.path.basename(file_path)}")
+        except FileNotFoundError:
+            pass
         except Exception as e:
             self.logger.error(f"Error deleting subpage file {file_path}: {e}")
     
@@ -222,15 +245,15 @@ class KnowledgeScraper:
                     self.logger.warning("Database handler not initialized for async mode")
                     return
                 
-                team_data = await self.db_handler.get_team_knowledge(self.team_id)
-                if team_data and 'items' in team_data:
-                    existing_urls = {item.get('source_url', '') for item in team_data['items'] if item.get('source_url')}
-                    self.existing_urls_from_db = existing_urls
+                existing_urls = await self.db_handler.get_team_source_urls(self.team_id)
+                self.existing_urls_from_db = existing_urls
+                self.existing_urls_loaded = True
+                if existing_urls:
                     self.logger.info(f"Loaded {len(existing_urls)} existing URLs from database for team {self.team_id}")
                 else:
                     self.logger.info(f"No existing data found for team {self.team_id}")
             else:
-                # For multiprocessing mode, we'll load this in the worker function
+                # Pool modes load this in __enter__ via _load_existing_urls_from_db_sync
                 pass
                 
         except Exception as e:
@@ -255,11 +278,11 @@ class KnowledgeScraper:
             try:
                 # Connect and get team data
                 loop.run_until_complete(temp_handler.connect())
-                team_data = loop.run_until_complete(temp_handler.get_team_knowledge(self.team_id))
+                existing_urls = loop.run_until_complete(temp_handler.get_team_source_urls(self.team_id))
+                self.existing_urls_from_db = existing_urls
+                self.existing_urls_loaded = True
                 
-                if team_data and 'items' in team_data:
-                    existing_urls = {item.get('source_url', '') for item in team_data['items'] if item.get('source_url')}
-                    self.existing_urls_from_db = existing_urls
+                if existing_urls:
                     self.logger.info(f"Loaded {len(existing_urls)} existing URLs from database for team {self.team_id}")
                 else:
                     self.logger.info(f"No existing data found for team {self.team_id}")
@@ -282,7 +305,7 @@ class KnowledgeScraper:
         return url in self.existing_urls_from_db
     
     def process_url_file_iterative(self, file_path: str) -> Dict[str, Any]:
-        """Process URLs from a file with iterative subpage discovery using multiprocessing."""
+        """Process URLs from a file with iterative subpage discovery using selected processing mode."""
         if self.processing_mode == "async":
             import asyncio
             return asyncio.run(self._process_url_file_iterative_async(file_path))
@@ -290,9 +313,9 @@ class KnowledgeScraper:
             return self._process_url_file_iterative_multiprocessing(file_path)
     
     def _process_url_file_iterative_multiprocessing(self, file_path: str) -> Dict[str, Any]:
-        """Process URLs from a file with iterative subpage discovery using multiprocessing."""
+        """Process URLs from a file with iterative subpage discovery using a worker pool."""
         try:
-            self.logger.info(f"Starting iterative knowledge extraction for team: {self.team_id} (Multiprocessing Mode)")
+            self.logger.info(f"Starting iterative knowledge extraction for team: {self.team_id} ({self.processing_mode.capitalize()} Mode)")
             
             # Load original URLs
             self.original_urls = self._load_urls_from_file(file_path)
@@ -472,24 +495,42 @@ class KnowledgeScraper:
                 self._delete_subpage_file(subpage_file_path)
             return self.stats
     
+    def _iter_worker_results(self, urls):
+        """Run process_single_url_worker for each URL on the active pool, yielding (url, result getter) pairs."""
+        if self.existing_urls_loaded:
+            # Existing URLs were fetched in bulk, so filter here instead of one database lookup per URL
+            to_process = []
+            for url in urls:
+                if self._should_skip_url(url):
+                    yield url, (lambda url=url: {'url': url, 'skipped': True, 'error': "URL already exists in database"})
+                else:
+                    to_process.append(url)
+            urls = to_process
+        args = (self.team_id, self.user_id, self.skip_existing_urls and not self.existing_urls_loaded)
+        if self.thread_pool:
+            future_to_url = {
+                self.thread_pool.submit(process_single_url_worker, url, *args, sessions=self.thread_sessions): url
+                for url in urls
+            }
+            for future in as_completed(future_to_url):
+                yield future_to_url[future], future.result
+        elif self.process_pool:
+            pending = [
+                (url, self.process_pool.apply_async(process_single_url_worker, args=(url, *args)))
+                for url in urls
+            ]
+            for url, async_result in pending:
+                yield url, async_result.get
+        else:
+            raise RuntimeError("Worker pool not initialized")
+    
     def _process_urls_iteration_parallel(self, urls: list, processed_urls: set) -> set:
-        if not self.process_pool:
-            raise RuntimeError("Process pool not initialized")
         iteration_discovered_urls = set()
         
-        # Submit all URLs to process pool
-        futures = []
-        for url in urls:
-            future = self.process_pool.apply_async(
-                process_single_url_worker,
-                args=(url, self.team_id, self.user_id, self.skip_existing_urls)
-            )
-            futures.append((future, url))
-        
-        # Collect results as they complete (non-blocking parallel collection)
-        for future, url in futures:
+        # Collect results as they complete
+        for url, get_result in self._iter_worker_results(urls):
             try:
-                result = future.get()  # type: ignore[attr-defined]
+                result = get_result()
                 if result:
                     if result.get('skipped'):
                         self.stats['urls_skipped'] += 1
@@ -615,9 +656,9 @@ class KnowledgeScraper:
             return self._process_url_file_multiprocessing(file_path, save_discovered_urls)
     
     def _process_url_file_multiprocessing(self, file_path: str, save_discovered_urls: bool = True) -> Dict[str, Any]:
-        """Process URLs from a file and extract knowledge using multiprocessing."""
+        """Process URLs from a file and extract knowledge using a worker pool."""
         try:
-            self.logger.info(f"Starting knowledge extraction for team: {self.team_id} (Multiprocessing Mode)")
+            self.logger.info(f"Starting knowledge extraction for team: {self.team_id} ({self.processing_mode.capitalize()} Mode)")
             
             # Load URLs from file
             urls = self._load_urls_from_file(file_path)
@@ -758,24 +799,11 @@ class KnowledgeScraper:
         return self.stats.copy()
 
     def _process_urls_parallel(self, urls: List[str]):
-        """Process URLs in parallel using multiprocessing."""
-        if not self.process_pool:
-            raise RuntimeError("Process pool not initialized")
-        
-        # Submit all URLs to process pool
-        future_to_url = {}
-        for url in urls:
-            future = self.process_pool.apply_async(
-                process_single_url_worker,
-                args=(url, self.team_id, self.user_id, self.skip_existing_urls)
-            )
-            future_to_url[future] = url
-        
+        """Process URLs in parallel using the thread or process pool."""
         # Collect results as they complete
-        for future in as_completed(future_to_url):
-            url = future_to_url[future]
+        for url, get_result in self._iter_worker_results(urls):
             try:
-                result = future.result()
+                result = get_result()
                 if result:
                     # Update statistics
                     if result.get('skipped'):
@@ -802,8 +830,67 @@ class KnowledgeScraper:
                 self.stats['errors'].append(f"Error processing {url}: {str(e)}")
                 self.logger.info(f"EXCEPTION: {url} - {str(e)}")
 
-def process_single_url_worker(url: str, team_id: str, user_id: str, skip_existing_urls: bool = False) -> Dict[str, Any]:
-    """Worker function to process a single URL in a separate process."""
+async def create_http_session() -> aiohttp.ClientSession:
+    """Create a pooled session bound to the running event loop."""
+    return aiohttp.ClientSession(
+        headers={'User-Agent': Config.USER_AGENT},
+        timeout=aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT),
+        connector=aiohttp.TCPConnector(limit_per_host=Config.MAX_CONCURRENT_REQUESTS)
+    )
+
+class WorkerSessionPool:
+    """Per-thread event loops and aiohttp sessions for one worker pool, so repeated fetches from
+    the same host ride pooled keep-alive connections; close() only touches this pool's sessions."""
+    
+    def __init__(self):
+        self._state = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+    
+    def get(self):
+        """Return the calling thread's event loop and session, creating them on first use."""
+        session = getattr(self._state, 'session', None)
+        if session is None or session.closed:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            session = loop.run_until_complete(create_http_session())
+            self._state.loop = loop
+            self._state.session = session
+            with self._lock:
+                self._sessions.append((loop, session))
+        return self._state.loop, session
+    
+    def close(self):
+        """Close every session this pool opened; call once its worker threads have finished."""
+        with self._lock:
+            sessions = self._sessions[:]
+            self._sessions.clear()
+        for loop, session in sessions:
+            try:
+                if not session.closed:
+                    loop.run_until_complete(session.close())
+                loop.close()
+            except Exception:
+                pass
+
+# Sessions of a multiprocessing worker process, created on first use
+_process_worker_sessions = None
+
+def get_process_worker_sessions() -> WorkerSessionPool:
+    """Return this worker process's session pool, closed when the process exits."""
+    global _process_worker_sessions
+    if _process_worker_sessions is None:
+        _process_worker_sessions = WorkerSessionPool()
+        # Pool workers run multiprocessing's exit finalizers when they stop after Pool.close()
+        Finalize(None, _process_worker_sessions.close, exitpriority=10)
+    return _process_worker_sessions
+
+def process_single_url_worker(url: str, team_id: str, user_id: str, skip_existing_urls: bool = False,
+                              sessions: WorkerSessionPool = None) -> Dict[str, Any]:
+    """Worker function to process a single URL in a worker thread or process.
+
+    Thread pools pass their own session pool; in a worker process the process-wide one is used.
+    """
     try:
         # Initialize components for this process
         url_processor = URLProcessor()
@@ -833,15 +920,12 @@ def process_single_url_worker(url: str, team_id: str, user_id: str, skip_existin
                 try:
                     # Connect using shared connection pool
                     loop.run_until_complete(db_handler.connect())
-                    team_data = loop.run_until_complete(db_handler.get_team_knowledge(team_id))
-                    
-                    if team_data and 'items' in team_data:
-                        existing_urls = {item.get('source_url', '') for item in team_data['items'] if item.get('source_url')}
-                        if url in existing_urls:
-                            result['skipped'] = True
-                            result['error'] = "URL already exists in database"
-                            # Don't disconnect since we're using shared pool
-                            return result
+                    existing_urls = loop.run_until_complete(db_handler.get_team_source_urls(team_id))
+                    if url in existing_urls:
+                        result['skipped'] = True
+                        result['error'] = "URL already exists in database"
+                        # Don't disconnect since we're using shared pool
+                        return result
                     
                     # Don't disconnect since we're using shared pool
                     
@@ -853,13 +937,20 @@ def process_single_url_worker(url: str, team_id: str, user_id: str, skip_existin
                 # If we can't check the database, continue processing
                 pass
         
+        # Steps 1 and 2 share this worker's pooled session instead of opening one per step
+        if sessions is None:
+            sessions = get_process_worker_sessions()
+        loop, session = sessions.get()
+        url_processor.session = session
+        content_extractor.session = session
+        
         # Step 1: Discover subpages
-        subpages = url_processor.discover_subpages_sync(url)
+        subpages = loop.run_until_complete(url_processor.discover_subpages(url))
         if subpages:
             result['subpages'] = subpages
         
         # Step 2: Extract content
-        content_data = content_extractor.extract_content_sync(url)
+        content_data = loop.run_until_complete(content_extractor.extract_content(url))
         if not content_data:
             result['error'] = "Failed to extract content"
             return result
@@ -899,6 +990,35 @@ def process_single_url_worker(url: str, team_id: str, user_id: str, skip_existin
             'error': str(e)
         }
 
+def _write_lines(lines: List[str]):
+    """Write a block of report lines to stdout in a single call."""
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+def print_search_results(query: str, results: List[Dict[str, Any]]):
+    """Print knowledge search results."""
+    lines = [f"\nSearch results for '{query}':"]
+    for result in results:
+        lines.append(f"Team: {result['team_id']}")
+        for item in result['items']:
+            lines.append(f"  - {item['title']}")
+            lines.append(f"    URL: {item['source_url']}")
+            lines.append(f"    Type: {item['content_type']}")
+            lines.append("")
+    _write_lines(lines)
+
+def print_statistics(stats: Dict[str, Any]):
+    """Print database statistics."""
+    _write_lines(["\nDatabase Statistics:"] + [f"  {key}: {value}" for key, value in stats.items()])
+
+def print_processing_statistics(stats: Dict[str, Any]):
+    """Print processing statistics followed by any errors."""
+    lines = ["\nProcessing Statistics:"]
+    lines.extend(f"  {key}: {value}" for key, value in stats.items() if key != 'errors')
+    if stats['errors']:
+        lines.append("\nErrors:")
+        lines.extend(f"  - {error}" for error in stats['errors'])
+    _write_lines(lines)
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description='Knowledge Scraper for Technical Content')
@@ -907,8 +1027,8 @@ def main():
     parser.add_argument('--user-id', default='', help='User ID (optional)')
     parser.add_argument('--save-urls', action='store_true', help='Save discovered URLs back to file')
     parser.add_argument('--iterative', action='store_true', help='Use iterative subpage discovery')
-    parser.add_argument('--processing-mode', choices=['multiprocessing', 'async'], default='multiprocessing', 
-                       help='Processing mode: multiprocessing (default) or async')
+    parser.add_argument('--processing-mode', choices=['threading', 'multiprocessing', 'async'], default='threading', 
+                       help='Processing mode: threading (default), multiprocessing or async')
     parser.add_argument('--skip-existing', action='store_true', help='Skip URLs that already exist in database')
     parser.add_argument('--search', help='Search existing knowledge')
     parser.add_argument('--stats', action='store_true', help='Show database statistics')
@@ -934,21 +1054,12 @@ def main():
                     if args.search:
                         # Search existing knowledge
                         results = scraper.search_knowledge(args.search)
-                        print(f"\nSearch results for '{args.search}':")
-                        for result in results:
-                            print(f"Team: {result['team_id']}")
-                            for item in result['items']:
-                                print(f"  - {item['title']}")
-                                print(f"    URL: {item['source_url']}")
-                                print(f"    Type: {item['content_type']}")
-                                print()
+                        print_search_results(args.search, results)
                     
                     elif args.stats:
                         # Show statistics
                         stats = scraper.get_statistics()
-                        print("\nDatabase Statistics:")
-                        for key, value in stats.items():
-                            print(f"  {key}: {value}")
+                        print_statistics(stats)
                     
                     else:
                         # Process URLs
@@ -963,15 +1074,7 @@ def main():
                             # Use legacy processing
                             stats = await scraper._process_url_file_async(args.url_file, args.save_urls)
                         
-                        print("\nProcessing Statistics:")
-                        for key, value in stats.items():
-                            if key != 'errors':
-                                print(f"  {key}: {value}")
-                        
-                        if stats['errors']:
-                            print("\nErrors:")
-                            for error in stats['errors']:
-                                print(f"  - {error}")
+                        print_processing_statistics(stats)
             
             # Run async function
             asyncio.run(run_async())
@@ -981,21 +1084,12 @@ def main():
                 if args.search:
                     # Search existing knowledge
                     results = scraper.search_knowledge(args.search)
-                    print(f"\nSearch results for '{args.search}':")
-                    for result in results:
-                        print(f"Team: {result['team_id']}")
-                        for item in result['items']:
-                            print(f"  - {item['title']}")
-                            print(f"    URL: {item['source_url']}")
-                            print(f"    Type: {item['content_type']}")
-                            print()
+                    print_search_results(args.search, results)
                 
                 elif args.stats:
                     # Show statistics
                     stats = scraper.get_statistics()
-                    print("\nDatabase Statistics:")
-                    for key, value in stats.items():
-                        print(f"  {key}: {value}")
+                    print_statistics(stats)
                 
                 else:
                     # Process URLs
@@ -1010,15 +1104,7 @@ def main():
                         # Use legacy processing
                         stats = scraper.process_url_file(args.url_file, args.save_urls)
                     
-                    print("\nProcessing Statistics:")
-                    for key, value in stats.items():
-                        if key != 'errors':
-                            print(f"  {key}: {value}")
-                    
-                    if stats['errors']:
-                        print("\nErrors:")
-                        for error in stats['errors']:
-                            print(f"  - {error}")
+                    print_processing_statistics(stats)
     finally:
         if listener:
             listener.stop()
@@ -5,15 +5,60 @@ Company Scrapper API - Function-based interface for the scrapper component
 
 import os
 import sys
-from typing import Dict, Any, Optional
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
-# Add the current directory to Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Add the current directory to Python path (once, so repeated imports don't grow the search path)
+_module_dir = os.path.dirname(os.path.abspath(__file__))
+if _module_dir not in sys.path:
+    sys.path.append(_module_dir)
 
 from main import KnowledgeScraper
 
+# Directory holding the per-team URL files (<project root>/data/scrapped_urls)
+_SCRAPPED_URLS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'scrapped_urls')
 
+# Successful read results: (kind, team_id, *args) -> (fetched_at, result); a scrape clears its team's entries
+RESULT_CACHE_TTL = 60
+RESULT_CACHE_SIZE = 256
+_result_cache: Dict[tuple, Tuple[float, Dict[str, Any]]] = {}
+_result_cache_lock = threading.Lock()
+
+
+def _get_cached_result(key: tuple) -> Optional[Dict[str, Any]]:
+    """Return a cached result younger than RESULT_CACHE_TTL, or None"""
+    with _result_cache_lock:
+        cached = _result_cache.get(key)
+    if cached and time.monotonic() - cached[0] < RESULT_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def _cache_result(key: tuple, result: Dict[str, Any]):
+    """Remember a successful result, evicting the oldest entry when full"""
+    if not result.get('success'):
+        return
+    with _result_cache_lock:
+        _result_cache.pop(key, None)
+        if len(_result_cache) >= RESULT_CACHE_SIZE:
+            _result_cache.pop(next(iter(_result_cache)))
+        _result_cache[key] = (time.monotonic(), result)
+
+
+def clear_result_cache(team_id: Optional[str] = None):
+    """Drop cached results for a team, or for every team when team_id is None"""
+    with _result_cache_lock:
+        if team_id is None:
+            _result_cache.clear()
+        else:
+            for key in [key for key in _result_cache if key[1] == team_id]:
+                del _result_cache[key]
+
+
+@lru_cache(maxsize=4096)
 def get_url_file_path(team_id: str) -> str:
     """
     Get the URL file path for a given team ID
@@ -24,24 +69,13 @@ def get_url_file_path(team_id: str) -> str:
     Returns:
         Path to the URL file
     """
-    try:
-        filename = f"{team_id}.txt"
-        
-        # Get the project root directory (two levels up from Scrapper)
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(current_dir)
-        output_dir = os.path.join(project_root, 'data', 'scrapped_urls')
-        file_path = os.path.join(output_dir, filename)
-        
-        return file_path
-    except Exception as e:
-        raise ValueError(f"Invalid team ID: {team_id}")
+    return os.path.join(_SCRAPPED_URLS_DIR, f"{team_id}.txt")
 
 
 def scrape_company_knowledge(
     team_id: str,
     user_id: str = "",
-    processing_mode: str = "multiprocessing",
+    processing_mode: str = "threading",
     save_discovered_urls: bool = True,
     iterative: bool = False,
     skip_existing_urls: bool = False
@@ -52,7 +86,8 @@ def scrape_company_knowledge(
     Args:
         team_id: Team ID for organizing knowledge
         user_id: User ID (optional)
-        processing_mode: Processing mode ("multiprocessing" or "async")
+        processing_mode: Processing mode ("threading", "multiprocessing" or "async");
+            use "multiprocessing" only for CPU-bound workloads
         save_discovered_urls: Whether to save discovered URLs back to file
         iterative: Whether to use iterative subpage discovery
         skip_existing_urls: Whether to skip URLs that already exist in database
@@ -88,13 +123,16 @@ def scrape_company_knowledge(
             # Run async function
             stats = asyncio.run(run_async())
         else:
-            # Use multiprocessing context manager
+            # Use the thread/process pool context manager
             with scraper:
                 if iterative:
                     stats = scraper.process_url_file_iterative(url_file_path)
                 else:
                     stats = scraper.process_url_file(url_file_path, save_discovered_urls)
         
+        # New knowledge may have been saved, so cached reads for this team are stale
+        clear_result_cache(team_id)
+        
         # Prepare return data
         result = {
             'success': True,
@@ -131,6 +169,11 @@ def search_company_knowledge(
     Returns:
         Dictionary containing search results
     """
+    cache_key = ('search', team_id, query)
+    cached = _get_cached_result(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
         # Initialize the scraper
         scraper = KnowledgeScraper(team_id, "", "multiprocessing")
@@ -138,12 +181,14 @@ def search_company_knowledge(
         # Search existing knowledge
         results = scraper.search_knowledge(query)
         
-        return {
+        result = {
             'success': True,
             'team_id': team_id,
             'query': query,
             'results': results
         }
+        _cache_result(cache_key, result)
+        return result
         
     except Exception as e:
         return {
@@ -188,17 +233,25 @@ def get_company_knowledge_statistics(
 
 
 def get_company_knowledge(
-    team_id: str
+    team_id: str,
+    use_cache: bool = True
 ) -> Dict[str, Any]:
     """
     Get all knowledge for a team
     
     Args:
         team_id: Team ID for organizing knowledge
+        use_cache: Reuse a result fetched in the last RESULT_CACHE_TTL seconds; pass False to
+            read the database (the fresh result is cached again)
         
     Returns:
         Dictionary containing all knowledge items
     """
+    cache_key = ('knowledge', team_id)
+    cached = _get_cached_result(cache_key) if use_cache else None
+    if cached is not None:
+        return cached
+    
     try:
         # Initialize the scraper
         scraper = KnowledgeScraper(team_id, "", "multiprocessing")
@@ -206,11 +259,13 @@ def get_company_knowledge(
         # Get team knowledge
         knowledge = scraper.get_team_knowledge()
         
-        return {
+        result = {
             'success': True,
             'team_id': team_id,
             'knowledge': knowledge
         }
+        _cache_result(cache_key, result)
+        return result
         
     except Exception as e:
         return {
@@ -6,137 +6,443 @@ A modern, elegant web interface for the Company Crawler and Scrapper system
 
 from importlib import reload
 import os
+import re
 import sys
+import tempfile
+import itertools
 import json
+import logging
+import multiprocessing
 import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import cache, lru_cache, partial
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from flask import Flask, render_template, request, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.routing import BaseConverter
 from werkzeug.utils import secure_filename
 import queue
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Get the script directory (UI directory) and project root
 script_dir = Path(__file__).parent.absolute()
 project_root = script_dir.parent
-# Add the project root to Python path
-sys.path.append(str(project_root))
-
-# Import the API modules
-from Crawler.crawler_api import crawl_company, add_urls_to_existing_file, extract_urls_from_text, crawl_trusted_base_urls_api
-from Scrapper.scrapper_api import (
-    scrape_company_knowledge, 
-    search_company_knowledge, 
-    get_company_knowledge_statistics,
-    get_company_knowledge
-)
+# Add the project root to Python path (run_ui.py may already have done so)
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+
+# The API modules pull in requests, BeautifulSoup, LLM and DB clients, so they are
+# imported on first use rather than at startup
+@cache
+def crawler_api():
+    """Import and return the Crawler API module"""
+    from Crawler import crawler_api as module
+    return module
+
+
+@cache
+def scrapper_api():
+    """Import and return the Scrapper API module"""
+    from Scrapper import scrapper_api as module
+    return module
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, keeping Flask's fallback for dates, UUIDs etc."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
 app.secret_key = 'company_scrapper_secret_key_2024'
+if orjson is not None:
+    # jsonify() and request.get_json() go through app.json
+    app.json = OrjsonProvider(app)
+
+
+class TeamIdConverter(BaseConverter):
+    """URL converter that normalizes team IDs to lowercase"""
+
+    def to_python(self, value):
+        return value.lower()
+
+
+app.url_map.converters['team'] = TeamIdConverter
+
+# Static CSS/JS is versioned by mtime in its URL, so browsers can keep it cached
+STATIC_MAX_AGE = 365 * 24 * 3600
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = STATIC_MAX_AGE
+
+
+@app.url_defaults
+def add_static_version(endpoint, values):
+    """Append the file's mtime to static URLs so cached copies are refreshed on change"""
+    if endpoint == 'static' and 'filename' in values:
+        try:
+            values['v'] = int(os.stat(os.path.join(app.static_folder, values['filename'])).st_mtime)
+        except OSError:
+            pass
+
+
+@dataclass(slots=True)
+class TaskState:
+    """Status of a background crawl/scrape task as reported to /api/task"""
+    status: str
+    progress: str
+    result: Optional[Dict[str, Any]] = None
+    log: list = field(default_factory=list)
+    version: int = 0
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the JSON shape polled by the frontend"""
+        return {'status': self.status, 'progress': self.progress, 'result': self.result, 'version': self.version}
+
 
 # Global state for background tasks
 task_queue = queue.Queue()
-active_tasks = {}
+active_tasks: Dict[str, TaskState] = {}
+# Guards active_tasks and the TaskState records inside it
+active_tasks_lock = threading.Lock()
+# Notified whenever a task changes, for long-polling /api/task requests
+task_changed = threading.Condition(active_tasks_lock)
+_task_versions = itertools.count(1)
+# Upper bound on how long /api/task?wait=N holds a request open
+TASK_LONG_POLL_MAX = 20
+# Long polls held at once; each occupies one of gunicorn's 8 request threads (Procfile), so at
+# most half are spent waiting and further pollers are answered at once and fall back to interval polling
+TASK_LONG_POLL_SLOTS = 4
+_long_poll_slots = threading.BoundedSemaphore(TASK_LONG_POLL_SLOTS)
+# Finished tasks are kept for polling this long, and at most this many tasks are tracked
+FINISHED_TASK_TTL = 3600
+MAX_TRACKED_TASKS = 500
+
+# Shared worker pool for crawl/scrape tasks (reused across requests)
+MAX_TASK_WORKERS = 4
+task_executor = ThreadPoolExecutor(max_workers=MAX_TASK_WORKERS, thread_name_prefix='task')
+# Queued plus running tasks allowed before new submissions are refused with 503
+MAX_PENDING_TASKS = MAX_TASK_WORKERS * 4
+# Sequence for task IDs; unlike second-resolution timestamps it never repeats within a process
+_task_seq = itertools.count(1)
+
+# Separate processes for CPU-heavy crawling so HTML parsing doesn't hold the server's GIL
+MAX_CRAWL_PROCESSES = 2
+_crawl_process_pool: Optional[ProcessPoolExecutor] = None
+_crawl_process_pool_lock = threading.Lock()
+
+
+def get_crawl_process_pool() -> ProcessPoolExecutor:
+    """Get the shared crawl process pool, creating it on first use"""
+    global _crawl_process_pool
+    with _crawl_process_pool_lock:
+        if _crawl_process_pool is None:
+            _crawl_process_pool = ProcessPoolExecutor(
+                max_workers=MAX_CRAWL_PROCESSES,
+                mp_context=multiprocessing.get_context('spawn'),
+                # Crawler log records go to the worker's stderr next to its print output; a partial of
+                # logging.basicConfig pickles by reference, so workers need not import this module
+                initializer=partial(logging.basicConfig, level=logging.INFO, format='%(message)s')
+            )
+        return _crawl_process_pool
+
+
+# Scheme followed by a non-empty host, e.g. rejects "http:///path"
+_URL_PREFIX_RE = re.compile(r'^https?://[^\s/]+', re.IGNORECASE)
+
+# URLs inside free-form input (newline/comma separated or embedded in text)
+_URL_RE = re.compile(r'https?://[^\s,<>"\'`]+', re.IGNORECASE)
+_SEPARATOR_RE = re.compile(r'[\n,]')
+
+# Allowed crawl sizes; arbitrary values are snapped up to the nearest step
+MAX_PAGES_OPTIONS = (10, 20, 50, 100, 200, 500, 1000)
+
+# Number of recent progress messages reported for a running task
+PROGRESS_LOG_LIMIT = 5
+
+# URL files up to this size are read with a single read() call
+_SINGLE_READ_LIMIT = 1024 * 1024
+
+# Cached URL file contents: path -> ((mtime_ns, size), (content, size, url_count))
+_SCRAPPED_URLS_DIR = os.path.join(str(project_root), 'data', 'scrapped_urls')
+
+URL_FILE_CACHE_SIZE = 64
+_url_file_cache: Dict[str, tuple] = {}
+
+# Cached get_company_knowledge results: team_id -> (fetched_at, result)
+KNOWLEDGE_CACHE_TTL = 60
+_knowledge_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+# Serialized /api/data payloads: team_id -> ((updated_at, item count) they were built from, payload)
+_knowledge_payload_cache: Dict[str, Tuple[tuple, bytes]] = {}
+
+# Serialized /api/urls payloads: team_id -> (load_url_file entry they were built from, payload)
+_urls_payload_cache: Dict[str, Tuple[tuple, bytes]] = {}
+
+# Largest slice of a URL file returned for display; the full file is served by /api/download
+URL_PREVIEW_MAX_BYTES = 256 * 1024
 
+
+@lru_cache(maxsize=4096)
 def validate_url(url: str) -> bool:
     """Validate if the provided URL is valid"""
-    if not url:
-        return False
-    return url.startswith(('http://', 'https://'))
+    return bool(url and _URL_PREFIX_RE.match(url))
+
+
+def set_task_state(task_id: str, state: TaskState):
+    """Replace the recorded state of a task"""
+    with active_tasks_lock:
+        state.version = next(_task_versions)
+        if state.status in ('completed', 'failed'):
+            state.finished_at = time.monotonic()
+        active_tasks[task_id] = state
+        task_changed.notify_all()
+
+
+def _prune_finished_tasks():
+    """Drop expired finished tasks, then the oldest finished ones beyond MAX_TRACKED_TASKS (lock held)"""
+    now = time.monotonic()
+    finished = [task_id for task_id, task in active_tasks.items() if task.finished_at is not None]
+    excess = len(active_tasks) - MAX_TRACKED_TASKS
+    for task_id in finished:
+        if excess > 0 or now - active_tasks[task_id].finished_at > FINISHED_TASK_TTL:
+            del active_tasks[task_id]
+            excess -= 1
+
+
+def queue_task(task_id: str, message: str, worker, *args) -> Optional[Tuple[str, int]]:
+    """Record a task as queued and submit its worker; returns (error, status code) if refused"""
+    with active_tasks_lock:
+        _prune_finished_tasks()
+        if task_id in active_tasks:
+            return f'Task {task_id} already exists', 409
+        pending = sum(1 for task in active_tasks.values() if task.status in ('queued', 'running'))
+        if pending >= MAX_PENDING_TASKS:
+            return 'Too many tasks in progress, please try again later', 503
+        active_tasks[task_id] = TaskState('queued', message, log=[message], version=next(_task_versions))
+    task_executor.submit(worker, task_id, *args)
+    return None
+
+
+def append_task_progress(task_id: str, message: str):
+    """Record a progress message for a task, exposing only the most recent ones"""
+    with active_tasks_lock:
+        task = active_tasks.get(task_id)
+        if task is None:
+            return
+        log = task.log
+        log.append(message)
+        if len(log) > PROGRESS_LOG_LIMIT:
+            del log[:-PROGRESS_LOG_LIMIT]
+        task.progress = ' '.join(log)
+        task.version = next(_task_versions)
+        task_changed.notify_all()
+
+
+def normalize_max_pages(value) -> int:
+    """Snap a requested page count to the nearest allowed option (rounding up)"""
+    try:
+        requested = int(value)
+    except (TypeError, ValueError):
+        return 20
+    for option in MAX_PAGES_OPTIONS:
+        if requested <= option:
+            return option
+    return MAX_PAGES_OPTIONS[-1]
 
 
+@lru_cache(maxsize=4096)
 def get_url_file_path(team_id: str) -> str:
     """Get the URL file path for a given team ID"""
+    return os.path.join(_SCRAPPED_URLS_DIR, f"{team_id}.txt")
+
+
+def _stat_or_none(file_path: str) -> Optional[os.stat_result]:
+    """Stat a file, returning None if it does not exist or cannot be accessed"""
     try:
-        filename = f"{team_id}.txt"
-        output_dir = project_root / 'data' / 'scrapped_urls'
-        file_path = output_dir / filename
-        return str(file_path)
-    except Exception:
-        return ""
+        return os.stat(file_path)
+    except OSError:
+        return None
 
 
-def read_url_file_content(team_id: str) -> str:
-    """Read the content of the URL file for a team"""
+def _read_text_file(file_path: str) -> str:
+    """Read a UTF-8 file with a single open/fstat/read"""
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        size = os.fstat(fd).st_size
+        if size <= _SINGLE_READ_LIMIT:
+            data = os.read(fd, size)
+        else:
+            # Large files: fill a buffer preallocated to the file size
+            data = bytearray(size)
+            offset = 0
+            while offset < size:
+                chunk = os.read(fd, min(_SINGLE_READ_LIMIT, size - offset))
+                if not chunk:
+                    break
+                data[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+            del data[offset:]
+        return data.decode('utf-8')
+    finally:
+        os.close(fd)
+
+
+def count_urls(text: str) -> int:
+    """Count non-blank lines (one URL per line) without building a list"""
+    return sum(1 for line in text.splitlines() if line.strip())
+
+
+def load_url_file(team_id: str) -> Optional[Tuple[str, int, int]]:
+    """
+    Load a team's URL file as (content, file_size, url_count).
+    
+    Returns None if the file does not exist. Results are cached per file and
+    reused until the file's modification time or size changes.
+    """
     file_path = get_url_file_path(team_id)
-    if not file_path or not os.path.exists(file_path):
-        return "No URL file found for this team."
+    st = _stat_or_none(file_path)
+    if st is None:
+        _url_file_cache.pop(file_path, None)
+        return None
+    
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _url_file_cache.get(file_path)
+    if cached and cached[0] == key:
+        return cached[1]
+    
+    content = _read_text_file(file_path)
+    url_count = count_urls(content)
+    entry = (content, st.st_size, url_count)
+    
+    if len(_url_file_cache) >= URL_FILE_CACHE_SIZE:
+        _url_file_cache.pop(next(iter(_url_file_cache)), None)
+    _url_file_cache[file_path] = (key, entry)
+    return entry
+
+
+def file_stats(team_id: str) -> Optional[Tuple[int, int]]:
+    """
+    Get (file_size, url_count) for a team's URL file without keeping its content.
+    
+    Uses the load_url_file cache when it is current, otherwise streams the file
+    in binary blocks. Returns None if the file does not exist.
+    """
+    file_path = get_url_file_path(team_id)
+    st = _stat_or_none(file_path)
+    if st is None:
+        return None
+    
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _url_file_cache.get(file_path)
+    if cached and cached[0] == key:
+        return cached[1][1], cached[1][2]
     
+    with open(file_path, 'rb', buffering=_SINGLE_READ_LIMIT) as f:
+        url_count = sum(1 for line in f if line.strip())
+    return st.st_size, url_count
+
+
+def preview_url_content(content: str, max_bytes: int = URL_PREVIEW_MAX_BYTES) -> Tuple[str, bool]:
+    """Return at most max_bytes of URL file content, cut on a line boundary"""
+    if len(content) <= max_bytes:
+        return content, False
+    preview = content[:max_bytes]
+    last_newline = preview.rfind('\n')
+    if last_newline > 0:
+        preview = preview[:last_newline]
+    return preview, True
+
+
+def read_url_file_content(team_id: str, max_bytes: int = URL_PREVIEW_MAX_BYTES) -> str:
+    """Read a bounded preview of the URL file for a team"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return content
+        entry = load_url_file(team_id)
     except Exception as e:
         return f"Error reading file: {str(e)}"
+    if entry is None:
+        return "No URL file found for this team."
+    content, file_size, _ = entry
+    preview, truncated = preview_url_content(content, max_bytes)
+    if truncated:
+        preview += f"\n(truncated — {len(preview)} bytes of {file_size})"
+    return preview
 
 
 def extract_urls_from_combined_input(text: str) -> tuple[list, str]:
     """Extract URLs from combined input"""
-    if not text:
+    if not text or text.isspace():
         return [], ""
     
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    urls = []
-    remaining_text_parts = []
+    # One regex pass handles URLs split by newlines, commas or embedded in prose
+    urls = [url.rstrip('.;:!?') for url in _URL_RE.findall(text)]
+    # Same check as validate_url, inlined to skip a call and cache lookup per URL
+    match_url_prefix = _URL_PREFIX_RE.match
+    urls = list(dict.fromkeys(url for url in urls if match_url_prefix(url)))
     
-    for line in lines:
-        if ',' in line:
-            parts = [part.strip() for part in line.split(',')]
-            for part in parts:
-                if validate_url(part):
-                    urls.append(part)
-                else:
-                    remaining_text_parts.append(part)
-        elif validate_url(line):
-            urls.append(line)
-        else:
-            remaining_text_parts.append(line)
-    
-    if remaining_text_parts:
-        remaining_text = '\n'.join(remaining_text_parts)
-        extracted_urls = extract_urls_from_text(remaining_text)
-        urls.extend(extracted_urls)
-    else:
-        remaining_text = ""
+    remaining_parts = (part.strip() for part in _SEPARATOR_RE.split(_URL_RE.sub('', text)))
+    remaining_text = '\n'.join(part for part in remaining_parts if part)
     
     return urls, remaining_text
 
 
-def deduplicate_url_file(team_id: str, company_url: str = ""):
-    """Deduplicate the URL file for a team and normalize the company_url (no trailing slash)."""
+def deduplicate_url_file(team_id: str, company_url: str = "", task_id: Optional[str] = None):
+    """Deduplicate the URL file for a team and normalize the company_url (no trailing slash).
+
+    Errors are reported to the task's progress log when task_id is given, otherwise logged.
+    """
     if team_id is None:
         return
     file_path = get_url_file_path(team_id)
-    if not file_path or not os.path.exists(file_path):
-        return
+    company_prefix = company_url.rstrip('/') if company_url else None
     try:
+        # Single pass: strip each line once, collapse the company_url with or without a
+        # trailing slash to its normalized form, and keep the first occurrence of each URL
+        deduped = {}
         with open(file_path, 'r', encoding='utf-8') as f:
-            urls = [line.strip() for line in f if line.strip()]
-        # Normalize company_url (remove trailing slash)
-        normalized_company_url = None
-        if company_url:
-            normalized_company_url = company_url.rstrip('/')
-        deduped = set()
-        result = []
-        for url in urls:
-            # If this is the company_url with trailing slash, skip it if the version without slash exists
-            if normalized_company_url and (url == normalized_company_url + '/'): 
-                if normalized_company_url in deduped:
-                    continue  # skip the version with slash if the one without exists
-            # Always store the normalized version only once
-            if normalized_company_url and url.rstrip('/') == normalized_company_url:
-                if normalized_company_url not in deduped:
-                    result.append(normalized_company_url)
-                    deduped.add(normalized_company_url)
-                continue
-            if url not in deduped:
-                result.append(url)
-                deduped.add(url)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            for url in result:
-                f.write(url + '\n')
+            for line in f:
+                url = line.strip()
+                if not url:
+                    continue
+                # Cheap prefix test first; only a URL starting with the company URL can match it
+                if company_prefix and url.startswith(company_prefix) and url.rstrip('/') == company_prefix:
+                    url = company_prefix
+                deduped[url] = None
+        
+        # Write to a uniquely named temporary file and swap it in, so a crash never leaves a truncated
+        # file and concurrent dedups of the same team file can't overwrite each other's temp file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), suffix='.tmp')
+        try:
+            try:
+                f = os.fdopen(fd, 'w', encoding='utf-8')
+            except BaseException:
+                os.close(fd)
+                raise
+            with f:
+                f.write('\n'.join(deduped) + '\n' if deduped else '')
+            # mkstemp creates the file owner-only; keep the team file's permissions
+            os.chmod(tmp_path, os.stat(file_path).st_mode & 0o777)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except FileNotFoundError:
+        return
     except Exception as e:
-        print(f"Error during deduplication: {e}")
+        if task_id is not None:
+            append_task_progress(task_id, f"Error during deduplication: {e}")
+        else:
+            logging.getLogger(__name__).warning(f"Error during deduplication: {e}")
 
 
 def crawl_company_worker(task_id: str, company_url: str, team_id: str, additional_urls: list, 
@@ -144,82 +450,58 @@ def crawl_company_worker(task_id: str, company_url: str, team_id: str, additiona
                         skip_founder_blogs: bool, skip_founder_search: bool, skip_words: list):
     """Worker function for crawling company in a separate thread"""
     
-    team_id = team_id.lower()
-    active_tasks[task_id] = {
-        'status': 'running',
-        'progress': 'Starting company crawling...',
-        'result': None
-    }
+    set_task_state(task_id, TaskState('running', 'Starting company crawling...', log=['Starting company crawling...']))
 
 
     def add_discovered_subpages_when_file_exists():
         file_path = get_url_file_path(team_id)
-        # Ensure the file exists, create if not
-        if not os.path.exists(file_path):
-            try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    pass
-                active_tasks[task_id]['progress'] += " URL file did not exist, created new file."
-            except Exception as e:
-                active_tasks[task_id]['progress'] += f" Failed to create URL file: {str(e)}"
-                return
-        # Wait for the file to exist (max 60s)
-        for _ in range(60):
-            if os.path.exists(file_path):
-                break
-            time.sleep(1)
-        else:
-            active_tasks[task_id]['progress'] += f" Timed out waiting for URL file to be created."
+        # Ensure the file exists before adding to it; exclusive create never truncates
+        # a file crawl_company has already started writing
+        try:
+            with open(file_path, 'x', encoding='utf-8') as f:
+                pass
+            append_task_progress(task_id, "URL file did not exist, created new file.")
+        except FileExistsError:
+            pass
+        except Exception as e:
+            append_task_progress(task_id, f"Failed to create URL file: {str(e)}")
             return
-        # Always add the original additional_urls themselves first
-        if additional_urls:
-            add_result = add_urls_to_existing_file(
-                team_id=team_id,
-                additional_urls=additional_urls
-            )
-            if add_result.get('success'):
-                active_tasks[task_id]['progress'] += f" Added {add_result.get('urls_added', 0)} original additional URLs."
-            else:
-                active_tasks[task_id]['progress'] += f" Failed to add original additional URLs: {add_result.get('error', 'Unknown error')}"
-        
         # Ensure at least the company_url is used for blog subpage search
-        base_urls_for_crawl = additional_urls if additional_urls else [company_url]
-        crawl_result = crawl_trusted_base_urls_api(
+        base_urls_for_crawl = list(additional_urls) if additional_urls else [company_url]
+        crawl_result = crawler_api().crawl_trusted_base_urls_api(
             base_urls=base_urls_for_crawl,
             skip_words=skip_words if skip_words else None,
             max_pages_per_domain=max_pages,
             output_file=file_path,
             homepage_url=company_url
         )
+        discovered_urls = []
         if crawl_result.get('success'):
             discovered_urls = crawl_result.get('discovered_urls', [])
-            add_result = add_urls_to_existing_file(
-                team_id=team_id,
-                additional_urls=discovered_urls
-            )
-            if add_result.get('success'):
-                active_tasks[task_id]['progress'] += f" Added {add_result.get('urls_added', 0)} discovered subpages from additional URLs."
-            else:
-                active_tasks[task_id]['progress'] += f" Failed to add discovered subpages: {add_result.get('error', 'Unknown error')}"
         else:
-            active_tasks[task_id]['progress'] += f" Failed to crawl additional URLs: {crawl_result.get('error', 'Unknown error')}"
-        # Also add any additional_text URLs
-        if additional_text:
-            add_result = add_urls_to_existing_file(
+            append_task_progress(task_id, f"Failed to crawl additional URLs: {crawl_result.get('error', 'Unknown error')}")
+        
+        # Add the original additional URLs, discovered subpages and additional_text URLs in one pass
+        merged_urls = list(additional_urls or []) + discovered_urls
+        if merged_urls or additional_text:
+            add_result = crawler_api().add_urls_to_existing_file(
                 team_id=team_id,
+                additional_urls=merged_urls,
                 additional_text=additional_text
             )
             if add_result.get('success'):
-                active_tasks[task_id]['progress'] += f" Added {add_result.get('urls_added', 0)} URLs from additional text."
+                append_task_progress(task_id, f"Added {add_result.get('urls_added', 0)} additional and discovered URLs.")
             else:
-                active_tasks[task_id]['progress'] += f" Failed to add URLs from additional text: {add_result.get('error', 'Unknown error')}"
+                append_task_progress(task_id, f"Failed to add additional URLs: {add_result.get('error', 'Unknown error')}")
 
     # Start the background thread for subpage discovery and URL addition
-    threading.Thread(target=add_discovered_subpages_when_file_exists, daemon=True).start()
+    subpage_thread = threading.Thread(target=add_discovered_subpages_when_file_exists, daemon=True)
+    subpage_thread.start()
 
     try:
-        # Perform crawling (this will create the file)
-        result = crawl_company(
+        # Perform crawling in a worker process (this will create the file)
+        result = get_crawl_process_pool().submit(
+            crawler_api().crawl_company,
             company_url=company_url,
             team_id=team_id,
             additional_urls=additional_urls if additional_urls else None,
@@ -230,23 +512,25 @@ def crawl_company_worker(task_id: str, company_url: str, team_id: str, additiona
             skip_founder_search=skip_founder_search,
             skip_words=skip_words if skip_words else None,
             simple_output=True
-        )
-
-        # Deduplicate the file after all crawling is complete
-        deduplicate_url_file(team_id, company_url)
-
-        active_tasks[task_id] = {
-            'status': 'completed',
-            'progress': 'Crawling completed successfully!' if result['success'] else f'Crawling failed: {result.get("error", "Unknown error")}',
-            'result': result
-        }
+        ).result()
+
+        # Deduplicate the file after all crawling is complete; the subpage thread appends to the
+        # same file, and its writes would go to the old inode once the deduped copy is swapped in
+        subpage_thread.join()
+        deduplicate_url_file(team_id, company_url, task_id)
+
+        set_task_state(task_id, TaskState(
+            status='completed',
+            progress='Crawling completed successfully!' if result['success'] else f'Crawling failed: {result.get("error", "Unknown error")}',
+            result=result
+        ))
             
     except Exception as e:
-        active_tasks[task_id] = {
-            'status': 'failed',
-            'progress': f'Crawling failed: {str(e)}',
-            'result': {'success': False, 'error': str(e)}
-        }
+        set_task_state(task_id, TaskState(
+            status='failed',
+            progress=f'Crawling failed: {str(e)}',
+            result={'success': False, 'error': str(e)}
+        ))
 
 
 def scrape_company_worker(task_id: str, team_id: str, user_id: str, additional_urls: list, 
@@ -254,27 +538,28 @@ def scrape_company_worker(task_id: str, team_id: str, user_id: str, additional_u
                          processing_mode: str):
     """Worker function for scraping company in a separate thread"""
     try:
-        team_id = team_id.lower()
-        active_tasks[task_id] = {
-            'status': 'running',
-            'progress': 'Starting knowledge scraping...',
-            'result': None
-        }
+        set_task_state(task_id, TaskState('running', 'Starting knowledge scraping...', log=['Starting knowledge scraping...']))
         
         # Ensure the file exists if additional URLs or text are provided
         file_path = get_url_file_path(team_id)
-        if (additional_urls or additional_text) and not os.path.exists(file_path):
+        if additional_urls or additional_text:
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
+                with open(file_path, 'x', encoding='utf-8') as f:
                     pass
-                active_tasks[task_id]['progress'] += " URL file did not exist, created new file."
+                append_task_progress(task_id, "URL file did not exist, created new file.")
+            except FileExistsError:
+                pass
             except Exception as e:
-                active_tasks[task_id]['progress'] += f" Failed to create URL file: {str(e)}"
+                set_task_state(task_id, TaskState(
+                    status='failed',
+                    progress=f'Failed to create URL file: {str(e)}',
+                    result={'success': False, 'error': str(e)}
+                ))
                 return
         
         # Perform scraping
-        active_tasks[task_id]['progress'] = 'Processing URLs and extracting knowledge...'
-        result = scrape_company_knowledge(
+        append_task_progress(task_id, 'Processing URLs and extracting knowledge...')
+        result = scrapper_api().scrape_company_knowledge(
             team_id=team_id,
             user_id=user_id,
             processing_mode=processing_mode,
@@ -282,19 +567,21 @@ def scrape_company_worker(task_id: str, team_id: str, user_id: str, additional_u
             iterative=iterative,
             skip_existing_urls=skip_existing_urls
         )
-        
-        active_tasks[task_id] = {
-            'status': 'completed',
-            'progress': 'Scraping completed successfully!' if result['success'] else f'Scraping failed: {result.get("error", "Unknown error")}',
-            'result': result
-        }
+        _knowledge_cache.pop(team_id, None)
+        _knowledge_payload_cache.pop(team_id, None)
+        
+        set_task_state(task_id, TaskState(
+            status='completed',
+            progress='Scraping completed successfully!' if result['success'] else f'Scraping failed: {result.get("error", "Unknown error")}',
+            result=result
+        ))
             
     except Exception as e:
-        active_tasks[task_id] = {
-            'status': 'failed',
-            'progress': f'Scraping failed: {str(e)}',
-            'result': {'success': False, 'error': str(e)}
-        }
+        set_task_state(task_id, TaskState(
+            status='failed',
+            progress=f'Scraping failed: {str(e)}',
+            result={'success': False, 'error': str(e)}
+        ))
 
 
 @app.route('/')
@@ -310,8 +597,8 @@ def start_crawl():
         data = request.get_json()
         
         # Validate required fields
-        company_url = data.get('company_url', '').strip()
-        team_id = data.get('team_id', '').strip().lower()
+        company_url = (data.get('company_url') or '').strip()
+        team_id = (data.get('team_id') or '').strip().lower()
         
         if not validate_url(company_url):
             return jsonify({'success': False, 'error': 'Invalid company URL'}), 400
@@ -320,28 +607,28 @@ def start_crawl():
             return jsonify({'success': False, 'error': 'Team ID is required'}), 400
         
         # Extract additional data
-        additional_input = data.get('additional_input', '')
-        skip_words = data.get('skip_words', '')
-        max_pages = int(data.get('max_pages', 20))
+        additional_input = data.get('additional_input') or ''
+        skip_words = data.get('skip_words') or ''
+        max_pages = normalize_max_pages(data.get('max_pages', 20))
         skip_external = data.get('skip_external', False)
         # If skipping external, also skip founder blogs
         skip_founder_blogs = skip_external
         
         # Process inputs
         additional_urls_list, additional_text = extract_urls_from_combined_input(additional_input)
-        skip_words_list = [word.strip() for word in skip_words.split('\n') if word.strip()] if skip_words else []
+        skip_words_list = list(dict.fromkeys(word.strip() for word in skip_words.splitlines() if word.strip())) if skip_words.strip() else []
         
         # Generate task ID
-        task_id = f"crawl_{int(time.time())}_{team_id}"
+        task_id = f"crawl_{next(_task_seq)}_{team_id}"
         
-        # Start crawling in background thread
-        thread = threading.Thread(
-            target=crawl_company_worker,
-            args=(task_id, company_url, team_id, additional_urls_list, additional_text, 
-                  max_pages, skip_external, skip_founder_blogs, False, skip_words_list)
+        # Run crawling on the shared worker pool
+        error = queue_task(
+            task_id, 'Waiting for a free worker...', crawl_company_worker,
+            company_url, team_id, additional_urls_list, additional_text,
+            max_pages, skip_external, skip_founder_blogs, False, skip_words_list
         )
-        thread.daemon = True
-        thread.start()
+        if error:
+            return jsonify({'success': False, 'error': error[0]}), error[1]
         
         return jsonify({
             'success': True,
@@ -360,32 +647,32 @@ def start_scrape():
         data = request.get_json()
         
         # Validate required fields
-        team_id = data.get('team_id', '').strip().lower()
+        team_id = (data.get('team_id') or '').strip().lower()
         
         if not team_id:
             return jsonify({'success': False, 'error': 'Team ID is required'}), 400
         
         # Extract additional data
         user_id = data.get('user_id', '').strip()
-        additional_input = data.get('additional_input', '')
+        additional_input = data.get('additional_input') or ''
         skip_existing_urls = data.get('skip_existing_urls', True)
         iterative = data.get('iterative', True)
-        processing_mode = data.get('processing_mode', 'multiprocessing')
+        processing_mode = data.get('processing_mode', 'threading')
         
         # Process inputs
         additional_urls_list, additional_text = extract_urls_from_combined_input(additional_input)
         
         # Generate task ID
-        task_id = f"scrape_{int(time.time())}_{team_id}"
+        task_id = f"scrape_{next(_task_seq)}_{team_id}"
         
-        # Start scraping in background thread
-        thread = threading.Thread(
-            target=scrape_company_worker,
-            args=(task_id, team_id, user_id, additional_urls_list, additional_text,
-                  skip_existing_urls, iterative, processing_mode)
+        # Run scraping on the shared worker pool
+        error = queue_task(
+            task_id, 'Waiting for a free worker...', scrape_company_worker,
+            team_id, user_id, additional_urls_list, additional_text,
+            skip_existing_urls, iterative, processing_mode
         )
-        thread.daemon = True
-        thread.start()
+        if error:
+            return jsonify({'success': False, 'error': error[0]}), error[1]
         
         return jsonify({
             'success': True,
@@ -399,33 +686,78 @@ def start_scrape():
 
 @app.route('/api/task/<task_id>')
 def get_task_status(task_id):
-    """Get task status"""
-    if task_id in active_tasks:
-        return jsonify(active_tasks[task_id])
+    """
+    Get task status.
+    
+    With ?since=<version>&wait=<seconds>, holds the request until the task's
+    version differs from `since` or the wait (capped at TASK_LONG_POLL_MAX) expires.
+    When TASK_LONG_POLL_SLOTS requests are already waiting, answers immediately.
+    """
+    since = request.args.get('since', type=int)
+    wait = min(request.args.get('wait', 0, type=float), TASK_LONG_POLL_MAX)
+    
+    def changed():
+        task = active_tasks.get(task_id)
+        return task is None or task.version != since
+    
+    # Snapshot under the lock, serialize outside it
+    holds_slot = since is not None and wait > 0 and _long_poll_slots.acquire(blocking=False)
+    try:
+        with active_tasks_lock:
+            if holds_slot:
+                task_changed.wait_for(changed, timeout=wait)
+            task = active_tasks.get(task_id)
+            snapshot = task.to_dict() if task is not None else None
+    finally:
+        if holds_slot:
+            _long_poll_slots.release()
+    if snapshot is not None:
+        return jsonify(snapshot)
     else:
         return jsonify({'status': 'not_found'}), 404
 
 
-@app.route('/api/urls/<team_id>')
+@app.route('/api/urls/<team:team_id>')
 def get_urls(team_id):
-    """Get URL file contents for a team"""
+    """Get URL file stats for a team, plus a content preview when called with ?full=1"""
     try:
-        team_id = team_id.lower()
-        file_content = read_url_file_content(team_id)
         file_path = get_url_file_path(team_id)
         
-        if file_content and file_content != "No URL file found for this team.":
-            file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
-            url_count = len([line for line in file_content.split('\n') if line.strip()])
-            
+        if request.args.get('full') != '1':
+            stats = file_stats(team_id)
+            if stats and stats[0]:
+                return jsonify({
+                    'success': True,
+                    'file_size': stats[0],
+                    'url_count': stats[1],
+                    'filename': os.path.basename(file_path)
+                })
             return jsonify({
+                'success': False,
+                'error': f'No URL file found for team {team_id}'
+            })
+        
+        entry = load_url_file(team_id)
+        if entry and entry[0]:
+            # load_url_file returns the same entry until the file changes, so reuse its payload
+            cached = _urls_payload_cache.get(team_id)
+            if cached and cached[0] is entry:
+                return app.response_class(cached[1], mimetype='application/json')
+            
+            file_content, file_size, url_count = entry
+            preview, truncated = preview_url_content(file_content)
+            payload = dumps_json({
                 'success': True,
-                'content': file_content,
+                'content': preview,
+                'truncated': truncated,
                 'file_size': file_size,
                 'url_count': url_count,
                 'filename': os.path.basename(file_path) if file_path else ''
             })
+            _urls_payload_cache[team_id] = (entry, payload)
+            return app.response_class(payload, mimetype='application/json')
         else:
+            _urls_payload_cache.pop(team_id, None)
             return jsonify({
                 'success': False,
                 'error': f'No URL file found for team {team_id}'
@@ -435,80 +767,138 @@ def get_urls(team_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@app.route('/api/data/<team_id>')
+def fetch_team_knowledge(team_id: str, refresh: bool = False) -> Dict[str, Any]:
+    """Get a team's knowledge, reusing a successful lookup for KNOWLEDGE_CACHE_TTL seconds"""
+    now = time.monotonic()
+    cached = None if refresh else _knowledge_cache.get(team_id)
+    if cached and now - cached[0] < KNOWLEDGE_CACHE_TTL:
+        return cached[1]
+    
+    # A refresh has to reach the database, so it skips the scrapper API's result cache too
+    result = scrapper_api().get_company_knowledge(team_id=team_id, use_cache=not refresh)
+    if result.get('success'):
+        _knowledge_cache[team_id] = (now, result)
+    else:
+        _knowledge_cache.pop(team_id, None)
+    return result
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize an object to JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str).encode('utf-8')
+
+
+def _minimize_knowledge_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a knowledge item to the fields shown in the data view"""
+    content = item.get('content') or ''
+    minimized = {
+        'title': item.get('title', 'Untitled'),
+        'source_url': item.get('source_url', 'N/A'),
+        'content_type': item.get('content_type', 'N/A'),
+        'created_at': str(item.get('created_at', 'N/A')),
+        'content_preview': content[:200] + "..." if len(content) > 200 else content
+    }
+    # Only ship the full content when the preview doesn't already contain all of it
+    if len(content) > 200:
+        minimized['content'] = content
+    elif not content:
+        minimized['content'] = 'No content available'
+    return minimized
+
+
+def serialize_team_knowledge(team_id: str, refresh: bool = False) -> bytes:
+    """Fetch a team's knowledge and serialize the display payload to JSON in one step"""
+    result = fetch_team_knowledge(team_id, refresh=refresh)
+    version = _knowledge_version(result)
+    cached = _knowledge_payload_cache.get(team_id)
+    if version is not None and cached and cached[0] == version:
+        return cached[1]
+    payload = _build_knowledge_payload(team_id, result)
+    if version is not None:
+        _knowledge_payload_cache[team_id] = (version, payload)
+    else:
+        _knowledge_payload_cache.pop(team_id, None)
+    return payload
+
+
+def _knowledge_version(result: Dict[str, Any]) -> Optional[tuple]:
+    """Identify a knowledge document by its update time and size, or None if there is none"""
+    knowledge = result.get('knowledge') if result.get('success') else None
+    if not (isinstance(knowledge, dict) and knowledge.get('items') and knowledge.get('updated_at')):
+        return None
+    return (str(knowledge['updated_at']), len(knowledge['items']))
+
+
+def _build_knowledge_payload(team_id: str, result: Dict[str, Any]) -> bytes:
+    """Serialize a get_company_knowledge result into the /api/data response body"""
+    
+    if not result['success']:
+        return dumps_json({
+            'success': False,
+            'error': result.get('error', 'Unknown error')
+        })
+    
+    knowledge = result.get('knowledge', [])
+    
+    # Create minimized version for display
+    if not (knowledge and isinstance(knowledge, dict) and knowledge.get('items')):
+        return dumps_json({
+            'success': False,
+            'error': f'No knowledge data found for team {team_id}'
+        })
+    
+    items = knowledge['items']
+    minimized_knowledge = {
+        'team_id': knowledge.get('team_id'),
+        'created_at': str(knowledge.get('created_at', 'N/A')),
+        'updated_at': str(knowledge.get('updated_at', 'N/A')),
+        'total_items': len(items),
+        'items': []
+    }
+    
+    # Encode items one at a time and splice them into the envelope, so the minimized
+    # dicts are never all alive at once
+    head, tail = dumps_json({'success': True, 'data': minimized_knowledge}).rsplit(b'[]', 1)
+    encoded_items = b','.join(dumps_json(_minimize_knowledge_item(item)) for item in items)
+    return b''.join((head, b'[', encoded_items, b']', tail))
+
+
+@app.route('/api/data/<team:team_id>')
 def get_data(team_id):
     """Get scraped data for a team"""
     try:
-        team_id = team_id.lower()
-        result = get_company_knowledge(team_id=team_id)
-        
-        if result['success']:
-            knowledge = result.get('knowledge', [])
-            
-            # Create minimized version for display
-            if knowledge and isinstance(knowledge, dict) and knowledge.get('items'):
-                items = knowledge['items']
-                minimized_items = []
-                
-                for item in items:
-                    minimized_item = {
-                        'title': item.get('title', 'Untitled'),
-                        'source_url': item.get('source_url', 'N/A'),
-                        'content_type': item.get('content_type', 'N/A'),
-                        'created_at': str(item.get('created_at', 'N/A')),
-                        'content_preview': item.get('content', '')[:200] + "..." if len(item.get('content', '')) > 200 else item.get('content', ''),
-                        'content': item.get('content', 'No content available')
-                    }
-                    minimized_items.append(minimized_item)
-                
-                minimized_knowledge = {
-                    'team_id': knowledge.get('team_id'),
-                    'created_at': str(knowledge.get('created_at', 'N/A')),
-                    'updated_at': str(knowledge.get('updated_at', 'N/A')),
-                    'total_items': len(items),
-                    'items': minimized_items
-                }
-                
-                return jsonify({
-                    'success': True,
-                    'data': minimized_knowledge
-                })
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': f'No knowledge data found for team {team_id}'
-                })
-        else:
-            return jsonify({
-                'success': False,
-                'error': result.get('error', 'Unknown error')
-            })
+        refresh = request.args.get('refresh') == '1'
+        payload = serialize_team_knowledge(team_id, refresh=refresh)
+        return app.response_class(payload, mimetype='application/json')
             
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@app.route('/api/download/<team_id>')
+@app.route('/api/download/<team:team_id>')
 def download_urls(team_id):
     """Download URL file"""
     try:
-        team_id = team_id.lower()
         file_path = get_url_file_path(team_id)
         
-        if file_path and os.path.exists(file_path):
-            return send_file(file_path, as_attachment=True, download_name=f"{team_id}.txt")
-        else:
+        try:
+            # Revalidate on every request (ETag / Last-Modified, Range) rather than using the
+            # long static max-age, since the URL file changes in place after each crawl
+            return send_file(file_path, as_attachment=True, download_name=f"{team_id}.txt",
+                             conditional=True, max_age=0)
+        except FileNotFoundError:
             return jsonify({'success': False, 'error': f'File not found for team {team_id}'}), 404
             
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@app.route('/api/delete/<team_id>', methods=['DELETE'])
+@app.route('/api/delete/<team:team_id>', methods=['DELETE'])
 def delete_files(team_id):
     """Delete URL file and its corresponding _subpage file"""
     try:
-        team_id = team_id.lower()
         main_file_path = get_url_file_path(team_id)
         
         # Generate the _subpage file path
@@ -522,20 +912,22 @@ def delete_files(team_id):
         errors = []
         
         # Delete main file
-        if os.path.exists(main_file_path):
-            try:
-                os.remove(main_file_path)
-                deleted_files.append(f"{team_id}.txt")
-            except Exception as e:
-                errors.append(f"Failed to delete main file: {str(e)}")
+        try:
+            os.remove(main_file_path)
+            deleted_files.append(f"{team_id}.txt")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            errors.append(f"Failed to delete main file: {str(e)}")
         
         # Delete _subpage file
-        if os.path.exists(subpage_file_path):
-            try:
-                os.remove(subpage_file_path)
-                deleted_files.append(f"{team_id}_subpage.txt")
-            except Exception as e:
-                errors.append(f"Failed to delete subpage file: {str(e)}")
+        try:
+            os.remove(subpage_file_path)
+            deleted_files.append(f"{team_id}_subpage.txt")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            errors.append(f"Failed to delete subpage file: {str(e)}")
         
         if not deleted_files and not errors:
             return jsonify({
@@ -82,6 +82,10 @@ const Validation = {
 // UI STATE MANAGEMENT
 // ============================================================================
 const UIState = {
+    // Retry delay after a failed status request; normal polling long-polls the server
+    taskPollIntervalMs: 2000,
+    // Seconds the server may hold a status request open waiting for a change
+    taskLongPollSeconds: 20,
     currentTaskId: null,
     taskCheckInterval: null,
     isCrawlerRunning: false,
@@ -99,7 +103,7 @@ const UIState = {
 
     clearTaskInterval() {
         if (this.taskCheckInterval) {
-            clearInterval(this.taskCheckInterval);
+            clearTimeout(this.taskCheckInterval);
             this.taskCheckInterval = null;
         }
     }
@@ -109,6 +113,15 @@ const UIState = {
 // UTILITY FUNCTIONS
 // ============================================================================
 const Utils = {
+    renderUrlList(container, data) {
+        const urls = (data.content || '').split(/\r?\n|,|\s+/).filter(Boolean);
+        let html = urls.map(url => `<div>${url}</div>`).join('');
+        if (data.truncated) {
+            html += `<div class="text-muted fst-italic">(truncated — showing ${urls.length} of ${data.url_count} URLs; download the file for the full list)</div>`;
+        }
+        container.innerHTML = html;
+    },
+
     showAlert(message, type = 'info') {
         console.log('showAlert called with:', message, type);
         const alertDiv = document.createElement('div');
@@ -150,12 +163,25 @@ const Utils = {
         }
     },
 
-    checkTaskStatus(taskId, progressContainer, progressBar, statusElement, onComplete) {
-        fetch(`/api/task/${taskId}`)
+    checkTaskStatus(taskId, progressContainer, progressBar, statusElement, onComplete, since = null) {
+        const params = since === null ? '' : `?since=${since}&wait=${UIState.taskLongPollSeconds}`;
+        const pollAgain = (version, delay) => {
+            UIState.taskCheckInterval = setTimeout(() => {
+                this.checkTaskStatus(taskId, progressContainer, progressBar, statusElement, onComplete, version);
+            }, delay);
+        };
+        // An unchanged version means the server didn't hold the request (all long-poll slots
+        // busy) or the wait ran out, so fall back to interval polling instead of spinning
+        const nextDelay = data => (data.version === since ? UIState.taskPollIntervalMs : 0);
+        fetch(`/api/task/${taskId}${params}`)
             .then(response => response.json())
             .then(data => {
-                if (data.status === 'running') {
+                if (data.status === 'queued') {
+                    this.updateProgress(progressBar, statusElement, 10, data.progress, 'info');
+                    pollAgain(data.version, nextDelay(data));
+                } else if (data.status === 'running') {
                     this.updateProgress(progressBar, statusElement, 50, data.progress, 'info');
+                    pollAgain(data.version, nextDelay(data));
                 } else if (data.status === 'completed') {
                     this.updateProgress(progressBar, statusElement, 100, data.progress, 'success');
                     setTimeout(() => {
@@ -169,11 +195,14 @@ const Utils = {
                         progressContainer.style.display = 'none';
                     }, 3000);
                     UIState.clearTaskInterval();
+                } else {
+                    pollAgain(since, UIState.taskPollIntervalMs);
                 }
             })
             .catch(error => {
                 console.error('Error checking task status:', error);
                 this.updateProgress(progressBar, statusElement, 100, 'Error checking status', 'error');
+                pollAgain(since, UIState.taskPollIntervalMs);
             });
     }
 };
@@ -214,23 +243,21 @@ const FormHandlers = {
                 UIState.setCrawlerRunning(true);
                 document.getElementById('crawlerProgress').style.display = 'block';
                 
-                UIState.taskCheckInterval = setInterval(() => {
-                    Utils.checkTaskStatus(
-                        UIState.currentTaskId,
-                        document.getElementById('crawlerProgress'),
-                        document.querySelector('#crawlerProgress .progress-bar'),
-                        document.getElementById('crawlerStatus'),
-                        (result) => {
-                            if (result.success) {
-                                ResultsDisplay.showCrawlerResults(result);
-                                Utils.showAlert('Crawling completed successfully!', 'success');
-                            } else {
-                                Utils.showAlert('Crawling failed: ' + result.error, 'danger');
-                            }
-                            UIState.setCrawlerRunning(false);
+                Utils.checkTaskStatus(
+                    UIState.currentTaskId,
+                    document.getElementById('crawlerProgress'),
+                    document.querySelector('#crawlerProgress .progress-bar'),
+                    document.getElementById('crawlerStatus'),
+                    (result) => {
+                        if (result.success) {
+                            ResultsDisplay.showCrawlerResults(result);
+                            Utils.showAlert('Crawling completed successfully!', 'success');
+                        } else {
+                            Utils.showAlert('Crawling failed: ' + result.error, 'danger');
                         }
-                    );
-                }, 1000);
+                        UIState.setCrawlerRunning(false);
+                    }
+                );
             } else {
                 Utils.showAlert('Failed to start crawling: ' + data.error, 'danger');
             }
@@ -274,23 +301,21 @@ const FormHandlers = {
                 UIState.setScraperRunning(true);
                 document.getElementById('scrapeProgress').style.display = 'block';
                 
-                UIState.taskCheckInterval = setInterval(() => {
-                    Utils.checkTaskStatus(
-                        UIState.currentTaskId,
-                        document.getElementById('scrapeProgress'),
-                        document.querySelector('#scrapeProgress .progress-bar'),
-                        document.getElementById('scrapeStatus'),
-                        (result) => {
-                            if (result.success) {
-                                ResultsDisplay.showScrapeResults(result);
-                                Utils.showAlert('Scraping completed successfully!', 'success');
-                            } else {
-                                Utils.showAlert('Scraping failed: ' + result.error, 'danger');
-                            }
-                            UIState.setScraperRunning(false);
+                Utils.checkTaskStatus(
+                    UIState.currentTaskId,
+                    document.getElementById('scrapeProgress'),
+                    document.querySelector('#scrapeProgress .progress-bar'),
+                    document.getElementById('scrapeStatus'),
+                    (result) => {
+                        if (result.success) {
+                            ResultsDisplay.showScrapeResults(result);
+                            Utils.showAlert('Scraping completed successfully!', 'success');
+                        } else {
+                            Utils.showAlert('Scraping failed: ' + result.error, 'danger');
                         }
-                    );
-                }, 1000);
+                        UIState.setScraperRunning(false);
+                    }
+                );
             } else {
                 Utils.showAlert('Failed to start scraping: ' + data.error, 'danger');
             }
@@ -320,7 +345,7 @@ const ButtonHandlers = {
         // Disable button during request
         document.getElementById('getUrlsBtn').disabled = true;
 
-        fetch(`/api/urls/${teamId}`)
+        fetch(`/api/urls/${teamId}?full=1`)
             .then(response => response.json())
             .then(data => {
                 console.log('Get URLs response:', data);
@@ -328,8 +353,7 @@ const ButtonHandlers = {
                     document.getElementById('urlsSection').style.display = 'block';
                     // Render URLs as a list for better readability
                     const urlsContent = document.getElementById('urlsContent');
-                    const urls = (data.content || '').split(/\r?\n|,|\s+/).filter(Boolean);
-                    urlsContent.innerHTML = urls.map(url => `<div>${url}</div>`).join('');
+                    Utils.renderUrlList(urlsContent, data);
                     Utils.showAlert(`Retrieved ${data.url_count} URLs from file`, 'success');
                 } else {
                     // Check if it's a "no data found" error
@@ -352,8 +376,9 @@ const ButtonHandlers = {
             });
     },
 
-    // Get Data button
-    handleGetData() {
+    // Get Data / Refresh Data buttons
+    handleGetData(event) {
+        const refresh = event?.currentTarget?.id === 'refreshDataBtn';
         const teamId = document.getElementById('dataTeamId').value.trim().toLowerCase();
         console.log('Get Data clicked for team ID:', teamId);
         
@@ -365,7 +390,7 @@ const ButtonHandlers = {
         // Disable button during request
         document.getElementById('getDataBtn').disabled = true;
 
-        fetch(`/api/data/${teamId}`)
+        fetch(`/api/data/${teamId}${refresh ? '?refresh=1' : ''}`)
             .then(response => response.json())
             .then(data => {
                 console.log('Get Data response:', data);
@@ -417,14 +442,13 @@ const ButtonHandlers = {
             // Disable button during request
             document.getElementById('refreshUrlsBtn').disabled = true;
 
-            fetch(`/api/urls/${teamId}`)
+            fetch(`/api/urls/${teamId}?full=1`)
                 .then(response => response.json())
                 .then(data => {
                     if (data.success) {
                         // Render URLs as a list for better readability
                         const urlFileContent = document.getElementById('urlFileContent');
-                        const urls = (data.content || '').split(/\r?\n|,|\s+/).filter(Boolean);
-                        urlFileContent.innerHTML = urls.map(url => `<div>${url}</div>`).join('');
+                        Utils.renderUrlList(urlFileContent, data);
                         Utils.showAlert('URL file refreshed', 'success');
                     }
                 })
@@ -505,14 +529,13 @@ const ResultsDisplay = {
         
         // Load URL file content
         const teamId = document.getElementById('teamId').value.trim().toLowerCase();
-        fetch(`/api/urls/${teamId}`)
+        fetch(`/api/urls/${teamId}?full=1`)
             .then(response => response.json())
             .then(data => {
                 if (data.success) {
                     // Render URLs as a list for better readability
                     const urlFileContent = document.getElementById('urlFileContent');
-                    const urls = (data.content || '').split(/\r?\n|,|\s+/).filter(Boolean);
-                    urlFileContent.innerHTML = urls.map(url => `<div>${url}</div>`).join('');
+                    Utils.renderUrlList(urlFileContent, data);
                 }
             });
     },
@@ -565,6 +588,7 @@ const EventListeners = {
         // Button clicks
         document.getElementById('getUrlsBtn').addEventListener('click', ButtonHandlers.handleGetUrls);
         document.getElementById('getDataBtn').addEventListener('click', ButtonHandlers.handleGetData);
+        document.getElementById('refreshDataBtn').addEventListener('click', ButtonHandlers.handleGetData);
         document.getElementById('downloadUrlsBtn').addEventListener('click', ButtonHandlers.handleDownloadUrls);
         document.getElementById('downloadUrlsDataBtn').addEventListener('click', ButtonHandlers.handleDownloadUrlsData);
         document.getElementById('refreshUrlsBtn').addEventListener('click', ButtonHandlers.handleRefreshUrls);